@@ -73,6 +73,13 @@ ALIASES_IMPORT_TO_PACKAGE: dict[str, str] = {}
 # Aliases package_name -> import_name canonique utilisé pour PyInstaller --collect-all. Extensible à l'exécution.
 PACKAGE_TO_IMPORT_NAME: dict[str, str] = {}
 
+# Motifs compilés une fois: requirements (egg/nom/version) et imports dynamiques par fichier
+_EGG_RE = re.compile(r"[#&]egg=([A-Za-z0-9_.\-]+)")
+_REQ_NAME_RE = re.compile(r"^([A-Za-z0-9_.\-]+)")
+_REQ_SPEC_RE = re.compile(r"===|==|!=|~=|>=|<=|>|<")
+_DUNDER_IMPORT_RE = re.compile(r"__import__\(['\"]([\w\.]+)['\"]\)")
+_IMPORTLIB_IMPORT_RE = re.compile(r"importlib\.import_module\(['\"]([\w\.]+)['\"]\)")
+
 
 # Fonctions d'extension d'alias (plug-and-play)
 def register_import_alias(import_name: str, package_name: str) -> None:
@@ -201,8 +208,6 @@ def _parse_requirements(requirements_path: str) -> set[str]:
     found: set[str] = set()
     if not os.path.isfile(requirements_path):
         return found
-    rx_egg = re.compile(r"[#&]egg=([A-Za-z0-9_.\-]+)")
-    rx_name = re.compile(r"^([A-Za-z0-9_.\-]+)")
     try:
         with open(requirements_path, encoding="utf-8", errors="ignore") as f:
             for raw in f:
@@ -216,14 +221,14 @@ def _parse_requirements(requirements_path: str) -> set[str]:
                 if ";" in line:
                     line = line.split(";", 1)[0].strip()
                 # VCS/URL with egg
-                m = rx_egg.search(line)
+                m = _EGG_RE.search(line)
                 if m:
                     found.add(m.group(1))
                     continue
                 # Name @ URL
                 if "@" in line:
                     name = line.split("@", 1)[0].strip()
-                    m2 = rx_name.match(name)
+                    m2 = _REQ_NAME_RE.match(name)
                     if m2:
                         found.add(m2.group(1))
                         continue
@@ -235,18 +240,15 @@ def _parse_requirements(requirements_path: str) -> set[str]:
                     if part:
                         found.add(part)
                         continue
-                # Strip versions
-                for sep in ("===", "==", ">=", "<=", "~=", ">", "<"):
-                    if sep in line:
-                        line = line.split(sep, 1)[0].strip()
-                        break
+                # Strip versions (cut at the first specifier)
+                line = _REQ_SPEC_RE.split(line, 1)[0].strip()
                 # Extras
                 if "[" in line and "]" in line:
                     base = line.split("[", 1)[0]
                     found.add(base)
                     found.add(line)  # keep original as hint
                 else:
-                    m3 = rx_name.match(line)
+                    m3 = _REQ_NAME_RE.match(line)
                     if m3:
                         found.add(m3.group(1))
     except Exception:
@@ -291,11 +293,9 @@ def _scan_imports(py_files: list[str], workspace_dir: str) -> set[str]:
                     if node.module:
                         found.add(node.module.split(".")[0])
             # Imports dynamiques
-            for m in re.findall(r"__import__\(['\"]([\w\.]+)['\"]\)", src):
+            for m in _DUNDER_IMPORT_RE.findall(src):
                 found.add(m.split(".")[0])
-            for m in re.findall(
-                r"importlib\.import_module\(['\"]([\w\.]+)['\"]\)", src
-            ):
+            for m in _IMPORTLIB_IMPORT_RE.findall(src):
                 found.add(m.split(".")[0])
         except Exception:
             continue
@@ -513,17 +513,10 @@ def _detect_modules_preferring_requirements(self) -> tuple[set[str], str]:
             if isinstance(deps, list):
                 for d in deps:
                     if isinstance(d, str) and d:
-                        mods.add(
-                            d.split(";", 1)[0]
-                            .split("[", 1)[0]
-                            .split("==", 1)[0]
-                            .split(">=", 1)[0]
-                            .split("<=", 1)[0]
-                            .split("~=", 1)[0]
-                            .split(">", 1)[0]
-                            .split("<", 1)[0]
-                            .strip()
-                        )
+                        # Nom de distribution en tête (extras, versions, marqueurs ignorés)
+                        m = _REQ_NAME_RE.match(d.strip())
+                        if m:
+                            mods.add(m.group(1))
             # poetry
             tool = data.get("tool") or {}
             poetry = tool.get("poetry") or {}
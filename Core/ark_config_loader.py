@@ -23,6 +23,9 @@ from pathlib import Path
 from typing import Any
 import yaml
 
+# libyaml (C) si PyYAML a été compilé avec, sinon implémentation pure Python
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 DEFAULT_EXCLUSION_PATTERNS = [
     "**/__pycache__/**",
@@ -127,6 +130,16 @@ def _deep_merge_dict(base: dict, override: dict) -> dict:
     return result
 
 
+# Noms de fichiers de config ARK, par ordre de priorité
+_ARK_CONFIG_PRIORITY = (
+    "ARK_Main_Config.yaml",
+    "ARK_Main_Config.yml",
+    ".ARK_Main_Config.yaml",
+    ".ARK_Main_Config.yml",
+)
+_ARK_CONFIG_SET = frozenset(_ARK_CONFIG_PRIORITY)
+
+
 def load_ark_config(workspace_dir: str) -> dict[str, Any]:
     """
     Charge la configuration ARK depuis ARK_Main_Config.yml (YAML ONLY)
@@ -152,19 +165,19 @@ def load_ark_config(workspace_dir: str) -> dict[str, Any]:
 
     workspace_path = Path(workspace_dir)
 
-    # Chercher les fichiers YAML dans l'ordre de priorité
+    # Chercher les fichiers YAML dans l'ordre de priorité (une seule lecture du dossier)
     # Priorité: ARK_Main_Config.yaml > ARK_Main_Config.yml > .ARK_Main_Config.yaml > .ARK_Main_Config.yml
-    config_candidates = [
-        workspace_path / "ARK_Main_Config.yaml",
-        workspace_path / "ARK_Main_Config.yml",
-        workspace_path / ".ARK_Main_Config.yaml",
-        workspace_path / ".ARK_Main_Config.yml",
-    ]
+    try:
+        with os.scandir(workspace_path) as it:
+            found = {e.name: e for e in it if e.name in _ARK_CONFIG_SET}
+    except OSError:
+        found = {}
 
     config_file = None
-    for candidate in config_candidates:
-        if candidate.exists() and candidate.is_file():
-            config_file = candidate
+    for name in _ARK_CONFIG_PRIORITY:
+        entry = found.get(name)
+        if entry is not None and entry.is_file():
+            config_file = Path(entry.path)
             break
 
     if not config_file:
@@ -172,7 +185,7 @@ def load_ark_config(workspace_dir: str) -> dict[str, Any]:
 
     try:
         with open(config_file, "r", encoding="utf-8") as f:
-            user_config = yaml.safe_load(f) or {}
+            user_config = yaml.load(f, Loader=_YamlLoader) or {}
 
         if not isinstance(user_config, dict):
             return config
@@ -390,7 +403,7 @@ def _read_yaml(path: Path) -> dict:
     try:
         if path.exists():
             with open(path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
+                data = yaml.load(f, Loader=_YamlLoader) or {}
                 return data if isinstance(data, dict) else {}
     except Exception:
         pass
@@ -87,6 +87,10 @@ EXCLUDED_STDLIB = {
     "tkinter",
 }
 
+# Imports dynamiques détectés dans le source (compilés une fois, réutilisés par fichier)
+_DUNDER_IMPORT_RE = re.compile(r"__import__\(['\"]([\w\.]+)['\"]\)")
+_IMPORTLIB_IMPORT_RE = re.compile(r"importlib\.import_module\(['\"]([\w\.]+)['\"]\)")
+
 
 @functools.lru_cache(maxsize=256)
 def _is_stdlib_module(module_name: str) -> bool:
@@ -286,11 +290,9 @@ def suggest_missing_dependencies(self):
                     if node.module:
                         modules.add(node.module.split(".")[0])
             # Imports dynamiques via __import__ ou importlib.import_module
-            dynamic_imports = re.findall(r"__import__\(['\"]([\w\.]+)['\"]\)", source)
+            dynamic_imports = _DUNDER_IMPORT_RE.findall(source)
             modules.update([mod.split(".")[0] for mod in dynamic_imports])
-            importlib_imports = re.findall(
-                r"importlib\.import_module\(['\"]([\w\.]+)['\"]\)", source
-            )
+            importlib_imports = _IMPORTLIB_IMPORT_RE.findall(source)
             modules.update([mod.split(".")[0] for mod in importlib_imports])
         except Exception as e:
             self.log.append(f"⚠️ Erreur analyse dépendances dans {file} : {e}")
@@ -16,6 +16,7 @@
 from __future__ import annotations
 
 import ast
+import copy
 import fnmatch
 import hashlib
 import http.client
@@ -24,6 +25,7 @@ import os
 import re
 import shutil
 import socket
+import stat
 import subprocess
 import sys
 import tempfile
@@ -346,11 +348,6 @@ def get_workspace_info(workspace_path: Pathish) -> dict[str, Any]:
     except Exception:
         pass
 
-    try:
-        info["python_files_count"] = len(list(path.rglob("*.py")))
-    except Exception:
-        pass
-
     try:
         info["has_requirements"] = (path / "requirements.txt").exists()
     except Exception:
@@ -366,8 +363,21 @@ def get_workspace_info(workspace_path: Pathish) -> dict[str, Any]:
     except Exception:
         pass
 
+    # Un seul parcours de l'arborescence pour le compte .py et la taille totale
     try:
-        total_size = sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+        py_count = 0
+        total_size = 0
+        for dirpath, _dirnames, filenames in os.walk(path):
+            for fname in filenames:
+                if fname.endswith(".py"):
+                    py_count += 1
+                try:
+                    st = os.stat(os.path.join(dirpath, fname))
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    total_size += st.st_size
+        info["python_files_count"] = py_count
         info["size_bytes"] = total_size
     except Exception:
         pass
@@ -539,6 +549,19 @@ def ensure_directory(path: Pathish) -> bool:
         return False
 
 
+# Common Python project files looked for by is_python_project
+_PROJECT_INDICATORS = frozenset(
+    {
+        "requirements.txt",
+        "pyproject.toml",
+        "setup.py",
+        "setup.cfg",
+        "Pipfile",
+        "poetry.lock",
+    }
+)
+
+
 def is_python_project(path: Pathish) -> bool:
     """Check if a directory appears to be a Python project.
 
@@ -564,27 +587,16 @@ def is_python_project(path: Pathish) -> bool:
     if not path_obj.exists():
         return False
 
-    # Check for Python files
+    # Single directory listing: Python files or common project files
     try:
-        if next(path_obj.glob("*.py"), None) is not None:
-            return True
+        with os.scandir(path_obj) as it:
+            for entry in it:
+                name = entry.name
+                if name.endswith(".py") or name in _PROJECT_INDICATORS:
+                    return True
     except Exception:
         pass
 
-    # Check for common Python project files
-    indicators = [
-        "requirements.txt",
-        "pyproject.toml",
-        "setup.py",
-        "setup.cfg",
-        "Pipfile",
-        "poetry.lock",
-    ]
-
-    for indicator in indicators:
-        if (path_obj / indicator).exists():
-            return True
-
     return False
 
 
@@ -811,6 +823,10 @@ def parse_requirements_txt(path: Pathish) -> List[str]:
     return requirements
 
 
+# Parsed pyproject.toml files: absolute path -> ((mtime_ns, size), data)
+_PYPROJECT_CACHE: dict[str, tuple[tuple[int, int], Dict[str, Any]]] = {}
+
+
 def parse_pyproject_toml(path: Pathish) -> Dict[str, Any]:
     """Parse pyproject.toml file.
 
@@ -831,8 +847,16 @@ def parse_pyproject_toml(path: Pathish) -> Dict[str, Any]:
         except ImportError:
             import tomllib  # Python 3.11+
 
-        with open(path, "rb") as f:
-            return tomllib.load(f)
+        key = os.path.abspath(path)
+        st = os.stat(key)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = _PYPROJECT_CACHE.get(key)
+        if cached is None or cached[0] != stamp:
+            with open(key, "rb") as f:
+                cached = (stamp, tomllib.load(f))
+            _PYPROJECT_CACHE[key] = cached
+        # Copy: callers may mutate the returned dict
+        return copy.deepcopy(cached[1])
     except Exception:
         return {}
 
@@ -1266,6 +1290,24 @@ def get_git_info(root: Pathish) -> GitInfo:
     # -----------------------------
 
 
+# Directories never descended when scanning a project (envs, tool caches, deps)
+_STRUCTURE_SKIP_DIRS = frozenset(
+    {
+        "venv",
+        ".venv",
+        "__pycache__",
+        ".git",
+        "node_modules",
+        ".tox",
+        ".eggs",
+        "__pypackages__",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+    }
+)
+
+
 def analyze_project_structure(root: Pathish) -> ProjectStructureInfo:
     """Analyze project structure and organization.
 
@@ -1285,18 +1327,20 @@ def analyze_project_structure(root: Pathish) -> ProjectStructureInfo:
 
     # Find Python files
     try:
-        for py_file in root_path.rglob("*.py"):
-            # Skip venv and cache
-            if any(
-                p in py_file.parts for p in ["venv", ".venv", "__pycache__", ".git"]
-            ):
-                continue
-
-            info.python_files.append(py_file)
+        for dirpath, dirnames, filenames in os.walk(root_path):
+            # Prune venv/cache trees in place so they are never descended
+            dirnames[:] = [d for d in dirnames if d not in _STRUCTURE_SKIP_DIRS]
+            dir_path = Path(dirpath)
+            in_tests = "tests" in dir_path.parts
+            for fname in filenames:
+                if not fname.endswith(".py"):
+                    continue
+                py_file = dir_path / fname
+                info.python_files.append(py_file)
 
-            # Check if test file
-            if "test" in py_file.name.lower() or "tests" in py_file.parts:
-                info.test_files.append(py_file)
+                # Check if test file
+                if in_tests or "test" in fname.lower():
+                    info.test_files.append(py_file)
     except Exception:
         pass
 
@@ -2034,6 +2078,25 @@ def check_dangerous_imports(root: Pathish) -> List[SecurityIssue]:
 # -----------------------------
 
 
+# Profondeur maximale explorée pour la recherche heuristique de __version__
+_MAX_VERSION_SEARCH_DEPTH = 5
+
+
+def _iter_init_files(root_path: Path) -> Iterator[Path]:
+    """Parcourt les __init__.py sous root_path, au plus _MAX_VERSION_SEARCH_DEPTH niveaux."""
+    base_depth = str(root_path).rstrip(os.sep).count(os.sep)
+    for dirpath, dirnames, filenames in os.walk(root_path):
+        if (
+            dirpath.rstrip(os.sep).count(os.sep) - base_depth
+            >= _MAX_VERSION_SEARCH_DEPTH
+        ):
+            dirnames[:] = []
+        else:
+            dirnames[:] = [d for d in dirnames if d not in _STRUCTURE_SKIP_DIRS]
+        if "__init__.py" in filenames:
+            yield Path(dirpath) / "__init__.py"
+
+
 def get_current_version(root: Pathish) -> Optional[str]:
     """Extrait la version actuelle du projet.
 
@@ -2079,8 +2142,8 @@ def get_current_version(root: Pathish) -> Optional[str]:
         except Exception:
             pass
 
-    # Vérifier __init__.py
-    for init_file in root_path.rglob("__init__.py"):
+    # Vérifier __init__.py (profondeur bornée, venv/caches élagués)
+    for init_file in _iter_init_files(root_path):
         try:
             with open(init_file, "r") as f:
                 content = f.read()
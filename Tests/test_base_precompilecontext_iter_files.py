@@ -13,9 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import unittest
 import tempfile
 from pathlib import Path
+from unittest import mock
 
 from bcasl.Base import PreCompileContext
 
@@ -51,6 +53,46 @@ class TestPreCompileContextIterFiles(unittest.TestCase):
         files = list(ctx.iter_files(["src/**/*.py"], ["venv/**"]))
         self.assertEqual([p.name for p in files], ["a.py"])
 
+    def test_iter_files_multiple_exclude_patterns(self):
+        (self.root / "src" / "gen").mkdir(exist_ok=True)
+        (self.root / "src" / "gen" / "g.py").write_text("x", encoding="utf-8")
+        ctx = PreCompileContext(
+            self.root, config={"options": {"iter_files_cache": False}}
+        )
+        files = list(ctx.iter_files(["**/*.py"], ["**/venv/**", "**/gen/*.py"]))
+        self.assertEqual([p.name for p in files], ["a.py"])
+
+    def test_iter_files_exclude_pattern_forms(self):
+        (self.root / "src" / "__pycache__").mkdir(exist_ok=True)
+        (self.root / "src" / "__pycache__" / "a.py").write_text("x", encoding="utf-8")
+        (self.root / "src" / "c.py").write_text("x", encoding="utf-8")
+        (self.root / "src" / "d1.py").write_text("x", encoding="utf-8")
+        (self.root / "src" / "e.py").write_text("x", encoding="utf-8")
+        ctx = PreCompileContext(
+            self.root, config={"options": {"iter_files_cache": False}}
+        )
+        files = list(
+            ctx.iter_files(
+                ["**/*.py"],
+                [
+                    "venv/**",
+                    "**/__pycache__/**",
+                    "src/c.py",
+                    "**/e.py",
+                    "src/d[0-9].py",
+                ],
+            )
+        )
+        self.assertEqual(sorted(p.name for p in files), ["a.py"])
+
+    def test_iter_files_relative_exclude_prunes_directory(self):
+        (self.root / "main.py").write_text("x", encoding="utf-8")
+        ctx = PreCompileContext(
+            self.root, config={"options": {"iter_files_cache": False}}
+        )
+        files = list(ctx.iter_files(["**/*.py"], ["venv/**"]))
+        self.assertEqual(sorted(p.name for p in files), ["a.py", "main.py"])
+
     def test_iter_files_cache_behavior(self):
         ctx = PreCompileContext(
             self.root, config={"options": {"iter_files_cache": True}}
@@ -68,6 +110,51 @@ class TestPreCompileContextIterFiles(unittest.TestCase):
         third = list(ctx_no_cache.iter_files(["src/**/*.py"]))
         self.assertIn("c.py", [p.name for p in third])
 
+    def test_iter_files_shared_cache_across_contexts(self):
+        opts = {"options": {"iter_files_cache": True}}
+        first = list(PreCompileContext(self.root, config=opts).iter_files(["src/*.py"]))
+        # Fresh context, unchanged tree: served from the shared cache
+        again = list(PreCompileContext(self.root, config=opts).iter_files(["src/*.py"]))
+        self.assertEqual(first, again)
+        # Adding a file changes the directory mtime and invalidates the entry
+        (self.root / "src" / "z.py").write_text("x", encoding="utf-8")
+        os.utime(self.root / "src", ns=(0, 0))
+        fresh = list(PreCompileContext(self.root, config=opts).iter_files(["src/*.py"]))
+        self.assertIn("z.py", [p.name for p in fresh])
+
+    def test_iter_paths_yields_str_matching_iter_files(self):
+        ctx = PreCompileContext(
+            self.root, config={"options": {"iter_files_cache": True}}
+        )
+        paths = list(ctx.iter_paths(["**/*.py"], ["venv/**"]))
+        self.assertTrue(all(isinstance(p, str) for p in paths))
+        self.assertEqual([os.path.basename(p) for p in paths], ["a.py"])
+        # iter_files shares the cache and only wraps each path in Path
+        self.assertEqual(
+            list(ctx.iter_files(["**/*.py"], ["venv/**"])), [Path(p) for p in paths]
+        )
+
+    def test_iter_files_only_descends_reachable_directories(self):
+        (self.root / "node_modules" / "pkg").mkdir(parents=True)
+        (self.root / "node_modules" / "pkg" / "x.py").write_text("x", encoding="utf-8")
+        ctx = PreCompileContext(
+            self.root, config={"options": {"iter_files_cache": False}}
+        )
+        real_scandir = os.scandir
+        with mock.patch("os.scandir", side_effect=real_scandir) as scandir:
+            files = list(ctx.iter_files(["src/*.py"]))
+        self.assertEqual([p.name for p in files], ["a.py"])
+        visited = {Path(c.args[0]).name for c in scandir.call_args_list}
+        # Only the root and src/ are listed: venv/ and node_modules/ are skipped
+        self.assertEqual(visited, {self.root.name, "src"})
+
+    def test_iter_files_trailing_double_star_matches_files(self):
+        ctx = PreCompileContext(
+            self.root, config={"options": {"iter_files_cache": False}}
+        )
+        files = list(ctx.iter_files(["src/**"]))
+        self.assertEqual(sorted(p.name for p in files), ["a.py", "b.txt"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -13,11 +13,38 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+import os
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
+
+from .workspace_support import isolate_bcasl_pycache
+
+_META_PLUGIN_SRC = """
+from bcasl import BcPluginBase, PluginMeta
+
+with open({log!r}, "a") as f:
+    f.write("x")
+
+
+class P(BcPluginBase):
+    def on_pre_compile(self, ctx):
+        pass
+
+
+def bcasl_register(manager):
+    manager.add_plugin(P(PluginMeta(id="{pid}", name="{pid}", version="1.0.0")))
+"""
 
 
 class TestBCASLLoader(unittest.TestCase):
+
+    def setUp(self):
+        isolate_bcasl_pycache(self)
+
     def test_load_workspace_config_shape(self):
         from bcasl.Loader import _load_workspace_config
 
@@ -39,6 +66,322 @@ class TestBCASLLoader(unittest.TestCase):
         options = cfg.get("options", {})
         self.assertIn("enabled", options)
 
+    def test_discover_meta_is_cached_until_plugins_change(self):
+        from bcasl import Loader, executor
+
+        tmp = Path(tempfile.mkdtemp(prefix="bcasl_meta_"))
+        self.addCleanup(shutil.rmtree, tmp, True)
+        api_dir = tmp / "plugins"
+        pkg = api_dir / "meta_a"
+        pkg.mkdir(parents=True)
+        init = pkg / "__init__.py"
+        log = tmp / "imports.log"
+        init.write_text(
+            _META_PLUGIN_SRC.format(pid="meta_a", log=str(log)), encoding="utf-8"
+        )
+
+        executor._plugin_pycache_dir.cache_clear()
+        self.addCleanup(executor._plugin_pycache_dir.cache_clear)
+        env = {"PYCOMPILER_BCASL_PYCACHE": str(tmp / "cache")}
+        with mock.patch.dict(os.environ, env), mock.patch.dict(Loader._META_CACHE):
+            self.assertIn("meta_a", Loader._discover_bcasl_meta(api_dir))
+            self.assertIn("meta_a", Loader._discover_bcasl_meta(api_dir))
+            self.assertEqual(log.read_text(), "x")
+            # A fresh process (empty memory cache) is served from the disk cache
+            Loader._META_CACHE.clear()
+            self.assertIn("meta_a", Loader._discover_bcasl_meta(api_dir))
+            self.assertEqual(log.read_text(), "x")
+            # Editing the plugin invalidates the signature
+            init.write_text(
+                _META_PLUGIN_SRC.format(pid="meta_b", log=str(log)) + "\n",
+                encoding="utf-8",
+            )
+            self.assertIn("meta_b", Loader._discover_bcasl_meta(api_dir))
+            self.assertEqual(log.read_text(), "xx")
+
+    def test_discover_meta_sees_submodule_changes(self):
+        from bcasl import Loader, executor
+
+        tmp = Path(tempfile.mkdtemp(prefix="bcasl_meta_sub_"))
+        self.addCleanup(shutil.rmtree, tmp, True)
+        api_dir = tmp / "plugins"
+        pkg = api_dir / "sub_a"
+        pkg.mkdir(parents=True)
+        (pkg / "__init__.py").write_text(
+            "from bcasl import BcPluginBase, PluginMeta\n"
+            "from .meta import TAGS\n\n\n"
+            "class P(BcPluginBase):\n"
+            "    def on_pre_compile(self, ctx):\n"
+            "        pass\n\n\n"
+            "def bcasl_register(manager):\n"
+            '    manager.add_plugin(P(PluginMeta(id="sub_a", name="sub_a",'
+            ' version="1.0.0", tags=TAGS)))\n',
+            encoding="utf-8",
+        )
+        sub = pkg / "meta.py"
+        sub.write_text('TAGS = ["lint"]\n', encoding="utf-8")
+
+        executor._plugin_pycache_dir.cache_clear()
+        self.addCleanup(executor._plugin_pycache_dir.cache_clear)
+        env = {"PYCOMPILER_BCASL_PYCACHE": str(tmp / "cache")}
+        with mock.patch.dict(os.environ, env), mock.patch.dict(Loader._META_CACHE):
+            meta = Loader._discover_bcasl_meta(api_dir)
+            self.assertEqual(meta["sub_a"]["tags"], ["lint"])
+            # Only the submodule changes; a restart must not serve stale tags
+            sub.write_text('TAGS = ["clean"]\n', encoding="utf-8")
+            st = sub.stat()
+            os.utime(sub, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            Loader._META_CACHE.clear()
+            meta = Loader._discover_bcasl_meta(api_dir)
+        self.assertEqual(meta["sub_a"]["tags"], ["clean"])
+
+    def test_discover_meta_reads_dropin_without_import(self):
+        from bcasl import Loader, executor
+
+        tmp = Path(tempfile.mkdtemp(prefix="bcasl_dropin_"))
+        self.addCleanup(shutil.rmtree, tmp, True)
+        api_dir = tmp / "plugins"
+        pkg = api_dir / "meta_a"
+        pkg.mkdir(parents=True)
+        log = tmp / "imports.log"
+        (pkg / "__init__.py").write_text(
+            _META_PLUGIN_SRC.format(pid="meta_a", log=str(log)), encoding="utf-8"
+        )
+
+        executor._plugin_pycache_dir.cache_clear()
+        self.addCleanup(executor._plugin_pycache_dir.cache_clear)
+        # Disk cache disabled: only the per-package dropin can avoid the import
+        env = {"PYCOMPILER_BCASL_PYCACHE": ""}
+        with mock.patch.dict(os.environ, env), mock.patch.dict(Loader._META_CACHE):
+            self.assertIn("meta_a", Loader._discover_bcasl_meta(api_dir))
+            self.assertTrue((pkg / ".bcasl_meta.json").is_file())
+            Loader._META_CACHE.clear()
+            self.assertIn("meta_a", Loader._discover_bcasl_meta(api_dir))
+            self.assertEqual(log.read_text(), "x")
+            # Forced refresh ignores every cache
+            with mock.patch.dict(os.environ, {"PYCOMPILER_BCASL_REFRESH_META": "1"}):
+                self.assertIn("meta_a", Loader._discover_bcasl_meta(api_dir))
+            self.assertEqual(log.read_text(), "xx")
+            # Dropins written with another format version are not trusted
+            dropin = pkg / ".bcasl_meta.json"
+            data = json.loads(dropin.read_text(encoding="utf-8"))
+            data["v"] = Loader._META_SCHEMA + 1
+            dropin.write_text(json.dumps(data), encoding="utf-8")
+            self.assertIsNone(Loader._read_dropin(pkg))
+
+    def test_discover_meta_unloads_its_modules(self):
+        import sys
+
+        from bcasl import Loader
+
+        tmp = Path(tempfile.mkdtemp(prefix="bcasl_unload_"))
+        self.addCleanup(shutil.rmtree, tmp, True)
+        api_dir = tmp / "plugins"
+        pkg = api_dir / "meta_u"
+        pkg.mkdir(parents=True)
+        (pkg / "__init__.py").write_text(
+            _META_PLUGIN_SRC.format(pid="meta_u", log=str(tmp / "imports.log")),
+            encoding="utf-8",
+        )
+        with mock.patch.dict(os.environ, {"PYCOMPILER_BCASL_PYCACHE": ""}):
+            meta = Loader._scan_bcasl_meta(api_dir, refresh=True)
+        self.assertIn("meta_u", meta)
+        self.assertFalse([k for k in sys.modules if k.startswith("bcasl_meta_meta_u")])
+
+    def test_static_tag_meta_does_not_execute_plugins(self):
+        from bcasl import Loader
+
+        tmp = Path(tempfile.mkdtemp(prefix="bcasl_static_"))
+        self.addCleanup(shutil.rmtree, tmp, True)
+        api_dir = tmp / "plugins"
+        pkg = api_dir / "static_a"
+        pkg.mkdir(parents=True)
+        (pkg / "__init__.py").write_text(
+            "raise RuntimeError('must not be imported')\n"
+            "META = PluginMeta(id='static_a', name='A', tags=['lint', 'check'])\n"
+            "def bcasl_register(manager):\n"
+            "    pass\n",
+            encoding="utf-8",
+        )
+        self.assertEqual(
+            Loader._static_tag_meta(api_dir), {"static_a": {"tags": ["lint", "check"]}}
+        )
+
+        # A non-literal id cannot be resolved statically: full discovery is needed
+        (pkg / "__init__.py").write_text(
+            "META = PluginMeta(id=make_id(), tags=[])\n"
+            "def bcasl_register(manager):\n"
+            "    pass\n",
+            encoding="utf-8",
+        )
+        self.assertIsNone(Loader._static_tag_meta(api_dir))
+
+    def test_tag_order_is_cached_until_plugins_change(self):
+        from bcasl import Loader
+
+        tmp = Path(tempfile.mkdtemp(prefix="bcasl_order_"))
+        self.addCleanup(shutil.rmtree, tmp, True)
+        api_dir = tmp / "plugins"
+        pkg = api_dir / "order_a"
+        pkg.mkdir(parents=True)
+        (pkg / "__init__.py").write_text("# a\n", encoding="utf-8")
+        meta_fn = mock.Mock(
+            return_value={"b": {"tags": ["lint"]}, "a": {"tags": ["clean"]}}
+        )
+        with mock.patch.dict(Loader._ORDER_CACHE, clear=True):
+            self.assertEqual(Loader._cached_tag_order(api_dir, meta_fn), ["a", "b"])
+            self.assertEqual(Loader._cached_tag_order(api_dir, meta_fn), ["a", "b"])
+            self.assertEqual(meta_fn.call_count, 1)
+            (pkg / "__init__.py").write_text("# a, edited\n", encoding="utf-8")
+            Loader._cached_tag_order(api_dir, meta_fn)
+            self.assertEqual(meta_fn.call_count, 2)
+
+    def test_disabled_packages_are_not_imported(self):
+        from bcasl import BCASL, Loader
+
+        tmp = Path(tempfile.mkdtemp(prefix="bcasl_skip_"))
+        self.addCleanup(shutil.rmtree, tmp, True)
+        api_dir = tmp / "plugins"
+        for pid in ("skip_a", "skip_b"):
+            pkg = api_dir / pid
+            pkg.mkdir(parents=True)
+            (pkg / "__init__.py").write_text(
+                _META_PLUGIN_SRC.format(pid=pid, log=str(tmp / f"{pid}.log")),
+                encoding="utf-8",
+            )
+        cfg = {"plugins": {"skip_a": {"enabled": False}, "skip_b": True}}
+        # Without dropins the package/id mapping is unknown: everything loads
+        self.assertEqual(Loader._disabled_packages(api_dir, cfg), set())
+        with mock.patch.dict(os.environ, {"PYCOMPILER_BCASL_PYCACHE": ""}):
+            Loader._scan_bcasl_meta(api_dir, refresh=True)
+        skip = Loader._disabled_packages(api_dir, cfg)
+        self.assertEqual(skip, {"skip_a"})
+
+        manager = BCASL(tmp, sandbox=False)
+        self.addCleanup(manager.close)
+        loaded, errors = manager.load_plugins_from_directory(api_dir, skip=skip)
+        self.assertEqual((loaded, errors), (1, []))
+        self.assertEqual((tmp / "skip_a.log").read_text(), "x")
+        self.assertEqual((tmp / "skip_b.log").read_text(), "xx")
+
+    def test_partial_registry_order_does_not_leak_into_defaults(self):
+        from bcasl import BCASL, Loader
+
+        tmp = Path(tempfile.mkdtemp(prefix="bcasl_order_src_"))
+        self.addCleanup(shutil.rmtree, tmp, True)
+        api_dir = tmp / "plugins"
+        for pid in ("skip_a", "skip_b"):
+            pkg = api_dir / pid
+            pkg.mkdir(parents=True)
+            (pkg / "__init__.py").write_text(
+                _META_PLUGIN_SRC.format(pid=pid, log=str(tmp / f"{pid}.log")),
+                encoding="utf-8",
+            )
+        cfg = {"plugins": {"skip_a": {"enabled": False}, "skip_b": True}}
+        with mock.patch.dict(Loader._ORDER_CACHE, clear=True), mock.patch.dict(
+            Loader._CFG_CACHE, clear=True
+        ), mock.patch.object(Loader, "_API_DIR", api_dir):
+            Loader._scan_bcasl_meta(api_dir, refresh=True)
+            manager = BCASL(tmp, sandbox=False)
+            self.addCleanup(manager.close)
+            manager.load_plugins_from_directory(
+                api_dir, skip=Loader._disabled_packages(api_dir, cfg)
+            )
+            # The registry only knows skip_b: its order must not be cached
+            Loader._apply_plugin_config(manager, cfg, api_dir)
+            workspace = tmp / "fresh"
+            workspace.mkdir()
+            defaults = Loader._load_workspace_config(workspace)
+        self.assertEqual(defaults["plugin_order"], ["skip_a", "skip_b"])
+        self.assertEqual(set(defaults["plugins"]), {"skip_a", "skip_b"})
+
+    def test_apply_plugin_config_sets_each_priority_once(self):
+        from bcasl.Loader import _apply_plugin_config
+
+        class _Manager:
+            def __init__(self):
+                self.disabled = []
+                self.calls = []
+
+            def disable_many(self, pids):
+                self.disabled.extend(sorted(pids))
+
+            def set_priorities(self, priorities):
+                self.calls.extend(priorities.items())
+
+        cfg = {
+            "plugins": {
+                "a": {"enabled": True, "priority": 7},
+                "b": {"enabled": False, "priority": 3},
+                "c": False,
+            },
+            "plugin_order": ["b", "a"],
+        }
+        mgr = _Manager()
+        logs = []
+        _apply_plugin_config(mgr, cfg, Path("."), logs.append)
+        self.assertEqual(mgr.disabled, ["b", "c"])
+        # plugin_order wins over explicit priorities, one entry per plugin
+        self.assertEqual(sorted(mgr.calls), [("a", 1), ("b", 0)])
+        self.assertEqual(len(logs), 1)
+
+    def test_configured_plugin_order_skips_tag_discovery(self):
+        from bcasl import Loader
+
+        class _Manager:
+            def __init__(self):
+                self.priorities = {}
+
+            def set_priorities(self, priorities):
+                self.priorities.update(priorities)
+
+        cfg = {"plugin_order": ["b", "a"]}
+        mgr = _Manager()
+        with mock.patch.object(Loader, "_cached_tag_order") as tag_order:
+            Loader._apply_plugin_config(mgr, cfg, Path("."))
+        tag_order.assert_not_called()
+        self.assertEqual(mgr.priorities, {"b": 0, "a": 1})
+
+    def test_apply_plugin_config_parses_priority_values(self):
+        from bcasl import Loader
+
+        class _Manager:
+            def __init__(self):
+                self.priorities = {}
+
+            def set_priorities(self, priorities):
+                self.priorities.update(priorities)
+
+        cfg = {
+            "plugins": {
+                "quoted": {"priority": "3"},
+                "signed": {"priority": " -2 "},
+                "floating": {"priority": 4.0},
+                "bad": {"priority": "high"},
+                "nan": {"priority": float("nan")},
+                "missing": {"enabled": True},
+            },
+            "plugin_order": [],
+        }
+        mgr = _Manager()
+        with mock.patch.object(Loader, "_cached_tag_order", return_value=[]):
+            Loader._apply_plugin_config(mgr, cfg, Path("."))
+        # Invalid or missing priorities keep the plugin's declared priority
+        self.assertEqual(mgr.priorities, {"quoted": 3, "signed": -2, "floating": 4})
+
+    def test_write_config_yml_is_atomic_and_skips_no_op(self):
+        from bcasl.Loader import _write_config_yml
+
+        tmp = Path(tempfile.mkdtemp(prefix="bcasl_cfg_"))
+        self.addCleanup(shutil.rmtree, tmp, True)
+        target = tmp / "bcasl.yml"
+        cfg = {"options": {"enabled": True}, "plugin_order": ["a"]}
+        self.assertTrue(_write_config_yml(target, cfg))
+        self.assertFalse(_write_config_yml(target, dict(cfg)))
+        cfg["plugin_order"] = ["a", "b"]
+        self.assertTrue(_write_config_yml(target, cfg))
+        self.assertEqual([p.name for p in tmp.iterdir()], ["bcasl.yml"])
+
 
 if __name__ == "__main__":
     unittest.main()
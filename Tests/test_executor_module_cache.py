@@ -0,0 +1,148 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025 Ague Samuel Amen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+from bcasl import BCASL
+from bcasl import executor
+from .workspace_support import isolate_bcasl_pycache
+
+_PLUGIN_SRC = """
+from pathlib import Path
+from bcasl import BcPluginBase, PluginMeta
+
+# Compte les exécutions du module
+_counter = Path(__file__).with_name("imports.txt")
+_counter.write_text(_counter.read_text() + "x" if _counter.exists() else "x")
+
+
+class P(BcPluginBase):
+    def on_pre_compile(self, ctx):
+        pass
+
+
+PLUGIN = P(PluginMeta(id="counted", name="counted", version="1.0.0"), priority=7)
+
+
+def bcasl_register(manager):
+    manager.add_plugin(PLUGIN)
+"""
+
+
+class TestExecutorModuleCache(unittest.TestCase):
+    def setUp(self):
+        self.pycache = isolate_bcasl_pycache(self)
+        BCASL.invalidate_module_cache()
+        self.tmp = Path(tempfile.mkdtemp(prefix="module_cache_"))
+        self.plugins = self.tmp / "plugins"
+        pkg = self.plugins / "counted"
+        pkg.mkdir(parents=True)
+        self.init_file = pkg / "__init__.py"
+        self.init_file.write_text(_PLUGIN_SRC, encoding="utf-8")
+        self.counter = pkg / "imports.txt"
+
+    def tearDown(self):
+        BCASL.invalidate_module_cache()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _load(self):
+        mgr = BCASL(self.tmp, sandbox=False)
+        count, errors = mgr.load_plugins_from_directory(self.plugins)
+        self.assertEqual((count, errors), (1, []))
+        return mgr
+
+    def test_unchanged_module_is_not_reexecuted(self):
+        first = self._load()
+        first.set_priority("counted", 0)
+        second = self._load()
+        self.assertEqual(self.counter.read_text(), "x")
+        # Les priorités modifiées par un gestionnaire précédent ne fuient pas
+        self.assertEqual(second.list_plugins()[0][3], 7)
+
+    def test_mtime_change_or_invalidation_reloads(self):
+        self._load()
+        st = self.init_file.stat()
+        os.utime(self.init_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self._load()
+        self.assertEqual(self.counter.read_text(), "xx")
+        BCASL.invalidate_module_cache()
+        self._load()
+        self.assertEqual(self.counter.read_text(), "xxx")
+
+    def test_submodule_change_reloads(self):
+        helper = self.init_file.with_name("helpers.py")
+        helper.write_text("VALUE = 1\n", encoding="utf-8")
+        self._load()
+        self._load()
+        self.assertEqual(self.counter.read_text(), "x")
+        helper.write_text("VALUE = 22\n", encoding="utf-8")
+        st = helper.stat()
+        os.utime(helper, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self._load()
+        self.assertEqual(self.counter.read_text(), "xx")
+
+    def test_cached_module_yields_fresh_plugin_instances(self):
+        first = self._load()
+        plugin = first._registry["counted"].plugin
+        plugin.state = "dirty"
+        second = self._load()
+        fresh = second._registry["counted"].plugin
+        self.assertIsNot(fresh, plugin)
+        self.assertFalse(hasattr(fresh, "state"))
+        # The sandbox still finds the module-level instance by attribute name
+        self.assertEqual(second._registry["counted"].plugin_attr_name, "PLUGIN")
+
+    def test_sandbox_loader_uses_precompiled_bytecode(self):
+        # Loading without a sandbox pool writes no bytecode
+        self._load()
+        self.assertEqual(list(self.pycache.glob("*.pyc")), [])
+        executor._precompile_plugin(str(self.init_file))
+        self.assertEqual(
+            [p.name for p in self.pycache.glob("*.pyc")],
+            [f"counted.{executor.sys.implementation.cache_tag}.pyc"],
+        )
+        loader = executor._PrecompiledSourceLoader("counted", str(self.init_file))
+        with unittest.mock.patch.object(
+            executor.importlib.machinery.SourceFileLoader, "get_code"
+        ) as compile_source:
+            self.assertIsNotNone(loader.get_code("counted"))
+        compile_source.assert_not_called()
+
+    def test_precompiled_bytecode_is_replaced_not_accumulated(self):
+        executor._precompile_plugin(str(self.init_file))
+        # Another package with the same plugin id reuses the same cache file
+        other = self.tmp / "elsewhere" / "counted"
+        other.mkdir(parents=True)
+        (other / "__init__.py").write_text(_PLUGIN_SRC + "\n# v2\n", encoding="utf-8")
+        executor._precompile_plugin(str(other / "__init__.py"))
+        pycs = list(self.pycache.glob("*.pyc"))
+        self.assertEqual(len(pycs), 1)
+        loader = executor._PrecompiledSourceLoader(
+            "counted", str(other / "__init__.py")
+        )
+        with unittest.mock.patch.object(
+            executor.importlib.machinery.SourceFileLoader, "get_code"
+        ) as compile_source:
+            loader.get_code("counted")
+        compile_source.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
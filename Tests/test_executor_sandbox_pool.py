@@ -0,0 +1,256 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025 Ague Samuel Amen
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from bcasl import BCASL, PreCompileContext, executor
+from .workspace_support import isolate_bcasl_pycache
+
+_PLUGIN_SRC = """
+import os
+import time
+from bcasl import BcPluginBase, PluginMeta
+
+
+class P(BcPluginBase):
+    def on_pre_compile(self, ctx):
+        if {sleep}:
+            time.sleep({sleep})
+        name = "{pid}-%d.pid" % os.getpid()
+        open(os.path.join(str(ctx.project_root), name), "w").close()
+
+
+PLUGIN = P(PluginMeta(id="{pid}", name="{pid}", version="1.0.0"))
+
+
+def bcasl_register(manager):
+    manager.add_plugin(PLUGIN)
+"""
+
+
+_FAILING_SRC = """
+from bcasl import BcPluginBase, PluginMeta
+
+
+class P(BcPluginBase):
+    def on_pre_compile(self, ctx):
+        raise RuntimeError("x" * 20000 + " fin-du-message")
+
+
+PLUGIN = P(PluginMeta(id="{pid}", name="{pid}", version="1.0.0"))
+
+
+def bcasl_register(manager):
+    manager.add_plugin(PLUGIN)
+"""
+
+
+_CONFIG_SRC = """
+import os
+from bcasl import BcPluginBase, PluginMeta
+
+
+class P(BcPluginBase):
+    def on_pre_compile(self, ctx):
+        name = "%s-%d.cfg" % (ctx.config.get("marker"), os.getpid())
+        open(os.path.join(str(ctx.project_root), name), "w").close()
+
+
+PLUGIN = P(PluginMeta(id="{pid}", name="{pid}", version="1.0.0"))
+
+
+def bcasl_register(manager):
+    manager.add_plugin(PLUGIN)
+"""
+
+
+class TestExecutorSandboxPool(unittest.TestCase):
+    def setUp(self):
+        self.pycache = isolate_bcasl_pycache(self)
+        self.tmp = Path(tempfile.mkdtemp(prefix="sandbox_pool_"))
+        self.root = self.tmp / "project"
+        self.root.mkdir()
+        self.plugins = self.tmp / "plugins"
+        self.old_par = os.environ.get("PYCOMPILER_BCASL_PARALLELISM")
+        os.environ["PYCOMPILER_BCASL_PARALLELISM"] = "1"
+
+    def tearDown(self):
+        if self.old_par is None:
+            os.environ.pop("PYCOMPILER_BCASL_PARALLELISM", None)
+        else:
+            os.environ["PYCOMPILER_BCASL_PARALLELISM"] = self.old_par
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write_plugin(self, pid, sleep=0):
+        pkg = self.plugins / pid
+        pkg.mkdir(parents=True)
+        (pkg / "__init__.py").write_text(
+            _PLUGIN_SRC.format(pid=pid, sleep=sleep), encoding="utf-8"
+        )
+
+    def _write_failing_plugin(self, pid):
+        pkg = self.plugins / pid
+        pkg.mkdir(parents=True)
+        (pkg / "__init__.py").write_text(_FAILING_SRC.format(pid=pid), encoding="utf-8")
+
+    def _write_config_plugin(self, pid):
+        pkg = self.plugins / pid
+        pkg.mkdir(parents=True)
+        (pkg / "__init__.py").write_text(_CONFIG_SRC.format(pid=pid), encoding="utf-8")
+
+    def _worker_pids(self):
+        return {p.name.split("-")[1] for p in self.root.glob("*.pid")}
+
+    def test_plugins_share_one_worker(self):
+        self._write_plugin("a")
+        self._write_plugin("b")
+        with BCASL(self.root, plugin_timeout_s=30.0) as mgr:
+            mgr.load_plugins_from_directory(self.plugins)
+            report = mgr.run_pre_compile()
+            self.assertTrue(report.ok, report.summary())
+            # Deuxième exécution: le même worker est réutilisé
+            self.assertTrue(mgr.run_pre_compile().ok)
+        self.assertEqual(len(list(self.root.glob("*.pid"))), 2)
+        self.assertEqual(len(self._worker_pids()), 1)
+        # Bytecode compiled for the sandboxed plugins only, in the test cache
+        self.assertEqual(len(list(self.pycache.glob("*.pyc"))), 2)
+
+    def test_timeout_replaces_worker(self):
+        self._write_plugin("a_slow", sleep=30)
+        self._write_plugin("b_fast")
+        with BCASL(self.root, plugin_timeout_s=1.0) as mgr:
+            mgr.load_plugins_from_directory(self.plugins)
+            report = mgr.run_pre_compile()
+        by_id = {item.plugin_id: item for item in report}
+        self.assertFalse(by_id["a_slow"].success)
+        self.assertIn("timeout", by_id["a_slow"].error)
+        self.assertTrue(by_id["b_fast"].success)
+
+    def test_trusted_plugin_runs_in_process(self):
+        self._write_plugin("a")
+        self._write_plugin("b")
+        cfg = {"options": {"trusted_plugins": ["a"]}}
+        with BCASL(self.root, cfg, plugin_timeout_s=30.0) as mgr:
+            mgr.load_plugins_from_directory(self.plugins)
+            self.assertTrue(mgr.run_pre_compile().ok)
+        self.assertTrue((self.root / f"a-{os.getpid()}.pid").exists())
+        self.assertFalse((self.root / f"b-{os.getpid()}.pid").exists())
+
+    def test_trusted_plugins_overlap(self):
+        self._write_plugin("a", sleep=1.0)
+        self._write_plugin("b", sleep=1.0)
+        os.environ["PYCOMPILER_BCASL_PARALLELISM"] = "2"
+        cfg = {"options": {"trusted_plugins": ["a", "b"]}}
+        with BCASL(self.root, cfg, plugin_timeout_s=30.0) as mgr:
+            mgr.load_plugins_from_directory(self.plugins)
+            start = time.perf_counter()
+            self.assertTrue(mgr.run_pre_compile().ok)
+            elapsed = time.perf_counter() - start
+        # Both threads run at once instead of one join after the other
+        self.assertLess(elapsed, 1.8)
+
+    def test_trusted_timeout_does_not_block_sandbox(self):
+        self._write_plugin("a_slow", sleep=6)
+        self._write_plugin("b_fast")
+        os.environ["PYCOMPILER_BCASL_PARALLELISM"] = "2"
+        cfg = {"options": {"trusted_plugins": ["a_slow"]}}
+        with BCASL(self.root, cfg, plugin_timeout_s=3.0) as mgr:
+            mgr.load_plugins_from_directory(self.plugins)
+            report = mgr.run_pre_compile()
+            self.assertIn("a_slow", mgr._timed_out_trusted)
+        by_id = {item.plugin_id: item for item in report}
+        self.assertIn("timeout", by_id["a_slow"].error)
+        self.assertTrue(by_id["b_fast"].success)
+        # The sandboxed result was collected while the thread was still running
+        self.assertEqual([item.plugin_id for item in report], ["b_fast", "a_slow"])
+
+    def test_trusted_timeout_keeps_dependents_blocked(self):
+        self._write_plugin("a_slow", sleep=4)
+        self._write_plugin("b_child")
+        self._write_plugin("c_grandchild")
+        self._write_plugin("d_other")
+        for pid, req in (("b_child", "a_slow"), ("c_grandchild", "b_child")):
+            init = self.plugins / pid / "__init__.py"
+            src = init.read_text(encoding="utf-8").replace(
+                'version="1.0.0"))', f'version="1.0.0"), requires=["{req}"])'
+            )
+            init.write_text(src, encoding="utf-8")
+        cfg = {"options": {"trusted_plugins": ["a_slow"]}}
+        with BCASL(self.root, cfg, plugin_timeout_s=1.5) as mgr:
+            mgr.load_plugins_from_directory(self.plugins)
+            report = mgr.run_pre_compile()
+        by_id = {item.plugin_id: item for item in report}
+        self.assertIn("timeout", by_id["a_slow"].error)
+        # The timed-out thread is still running: its dependents must not start
+        for pid in ("b_child", "c_grandchild"):
+            self.assertFalse(by_id[pid].success)
+            self.assertIn("a_slow", by_id[pid].error)
+            self.assertEqual(list(self.root.glob(f"{pid}-*.pid")), [])
+        self.assertTrue(by_id["d_other"].success)
+
+    def test_inproc_plugin_skips_sandbox(self):
+        self._write_plugin("a")
+        self._write_plugin("b")
+        init = self.plugins / "a" / "__init__.py"
+        src = init.read_text(encoding="utf-8")
+        src = src.replace(
+            "from bcasl import BcPluginBase, PluginMeta",
+            "from bcasl import BcPluginBase, PluginMeta, register_plugin",
+        ).replace("class P(", "@register_plugin(inproc=True)\nclass P(")
+        init.write_text(src, encoding="utf-8")
+        with BCASL(self.root, plugin_timeout_s=30.0) as mgr:
+            mgr.load_plugins_from_directory(self.plugins)
+            self.assertTrue(mgr.run_pre_compile().ok)
+        self.assertTrue((self.root / f"a-{os.getpid()}.pid").exists())
+        self.assertFalse((self.root / f"b-{os.getpid()}.pid").exists())
+
+    def test_config_change_reaches_warm_worker(self):
+        self._write_config_plugin("cfg")
+        with BCASL(self.root, {"marker": "one"}, plugin_timeout_s=30.0) as mgr:
+            mgr.load_plugins_from_directory(self.plugins)
+            self.assertTrue(mgr.run_pre_compile().ok)
+            ctx = PreCompileContext(self.root, {"marker": "two"})
+            self.assertTrue(mgr.run_pre_compile(ctx).ok)
+        names = sorted(p.name.split("-") for p in self.root.glob("*.cfg"))
+        self.assertEqual([n[0] for n in names], ["one", "two"])
+        # Même worker pour les deux exécutions: seule la config a été renvoyée
+        self.assertEqual(names[0][1], names[1][1])
+
+    def test_error_traceback_is_truncated(self):
+        self._write_failing_plugin("boom")
+        with BCASL(self.root, plugin_timeout_s=30.0) as mgr:
+            mgr.load_plugins_from_directory(self.plugins)
+            item = list(mgr.run_pre_compile())[0]
+        self.assertFalse(item.success)
+        self.assertLessEqual(len(item.error), 4100)
+        self.assertIn("fin-du-message", item.error)
+
+    def test_duration_is_timed_inside_worker(self):
+        # The worker's own timing wins; the parent's wall clock (IPC included)
+        # is only a fallback for crashes where the worker reported nothing
+        item = executor._item_from_result("a", "a", (True, "", 12.5), 80.0)
+        self.assertEqual(item.duration_ms, 12.5)
+        item = executor._item_from_result("a", "a", executor._crash_result(80.0), 80.0)
+        self.assertFalse(item.success)
+        self.assertEqual(item.duration_ms, 80.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
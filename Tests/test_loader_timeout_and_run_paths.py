@@ -16,9 +16,10 @@
 import os
 import json
 import unittest
+from unittest import mock
 
 from bcasl.Loader import resolve_bcasl_timeout, run_pre_compile
-from .workspace_support import get_shared_workspace
+from .workspace_support import get_shared_workspace, isolate_bcasl_pycache
 
 
 class Dummy:
@@ -37,6 +38,7 @@ class Dummy:
 
 class TestLoaderTimeoutAndRunPaths(unittest.TestCase):
     def setUp(self):
+        isolate_bcasl_pycache(self)
         self.ws = get_shared_workspace()
         # Clean artifacts between runs (keep baseline ARK_Main_Config.yml)
         for name in ("bcasl.yaml", "bcasl.yml", "bcasl.json", ".bcasl.json"):
@@ -92,6 +94,23 @@ class TestLoaderTimeoutAndRunPaths(unittest.TestCase):
         rep = run_pre_compile(d)
         self.assertIsNone(rep)
 
+    def test_run_pre_compile_closes_manager_on_error(self):
+        from bcasl import BCASL
+
+        d = Dummy(str(self.ws))
+        with mock.patch.object(
+            BCASL, "load_plugins_from_directory", return_value=(0, [])
+        ), mock.patch.object(
+            BCASL, "run_pre_compile", side_effect=RuntimeError("boom")
+        ), mock.patch.object(
+            BCASL, "close"
+        ) as close:
+            rep = run_pre_compile(d)
+        self.assertIsNone(rep)
+        # Sandbox workers are stopped even when the run raises
+        close.assert_called_once_with()
+        self.assertTrue(any("boom" in line for line in d.log._data))
+
 
 if __name__ == "__main__":
     unittest.main()
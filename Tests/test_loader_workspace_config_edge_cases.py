@@ -16,14 +16,16 @@
 import json
 import unittest
 from pathlib import Path
+from unittest import mock
 
-from bcasl.Loader import _load_workspace_config
+from bcasl.Loader import _load_workspace_config, _workspace_options
 from .workspace_support import get_shared_workspace
 
 
 class TestLoaderWorkspaceConfigEdgeCases(unittest.TestCase):
     def setUp(self):
         self.tmp = get_shared_workspace()
+        _load_workspace_config.cache_clear()
         # Clean artifacts created by previous tests if any
         for name in (
             "bcasl.yaml",
@@ -85,6 +87,61 @@ class TestLoaderWorkspaceConfigEdgeCases(unittest.TestCase):
         self.assertIn("required_files", cfg)
         self.assertIsInstance(cfg["required_files"], list)
 
+    def test_config_cache_tracks_file_changes(self):
+        target = self.tmp / "bcasl.yml"
+        target.write_text("options:\n  plugin_timeout_s: 1.0\n", encoding="utf-8")
+        cfg = _load_workspace_config(self.tmp)
+        self.assertEqual(cfg["options"]["plugin_timeout_s"], 1.0)
+        # Mutating the returned dict must not leak into the memoized config
+        cfg["options"]["plugin_timeout_s"] = 99.0
+        self.assertEqual(
+            _load_workspace_config(self.tmp)["options"]["plugin_timeout_s"], 1.0
+        )
+        target.write_text("options:\n  plugin_timeout_s: 25.0\n", encoding="utf-8")
+        self.assertEqual(
+            _load_workspace_config(self.tmp)["options"]["plugin_timeout_s"], 25.0
+        )
+
+    def test_workspace_options_reads_memoized_config(self):
+        target = self.tmp / "bcasl.yml"
+        target.write_text(
+            "options:\n  plugin_timeout_s: 3.0\n  enabled: false\n", encoding="utf-8"
+        )
+        self.assertEqual(_workspace_options(self.tmp), (3.0, False))
+        # Served from the cache without copying the whole config
+        with mock.patch("bcasl.Loader.copy.deepcopy") as deepcopy:
+            self.assertEqual(_workspace_options(self.tmp), (3.0, False))
+        deepcopy.assert_not_called()
+        target.write_text("options:\n  plugin_timeout_s: 4.0\n", encoding="utf-8")
+        self.assertEqual(_workspace_options(self.tmp), (4.0, True))
+
+    def test_read_only_workspace_defaults_are_memoized(self):
+        with mock.patch.dict("bcasl.Loader._CFG_CACHE", clear=True), mock.patch.dict(
+            "bcasl.Loader._ORDER_CACHE", clear=True
+        ), mock.patch("bcasl.Loader.os.access", return_value=False), mock.patch(
+            "bcasl.Loader._static_tag_meta", return_value={"p": {"tags": []}}
+        ) as static_meta:
+            first = _load_workspace_config(self.tmp)
+            second = _load_workspace_config(self.tmp)
+        self.assertEqual(first, second)
+        self.assertEqual(first["plugin_order"], ["p"])
+        self.assertFalse((self.tmp / "bcasl.yml").exists())
+        # Defaults computed once, then served from the cache
+        self.assertEqual(static_meta.call_count, 1)
+
+    def test_hidden_config_read_only_when_regular_file(self):
+        hidden = self.tmp / ".bcasl.yml"
+        hidden.mkdir()
+        self.addCleanup(lambda: hidden.rmdir() if hidden.is_dir() else hidden.unlink())
+        with mock.patch("bcasl.Loader.os.access", return_value=False):
+            cfg = _load_workspace_config(self.tmp)
+        # A directory named like a config file is not a config source
+        self.assertIn("plugin_order", cfg)
+        hidden.rmdir()
+        hidden.write_text("options:\n  plugin_timeout_s: 7.0\n", encoding="utf-8")
+        cfg = _load_workspace_config(self.tmp)
+        self.assertEqual(cfg["options"]["plugin_timeout_s"], 7.0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -16,7 +16,11 @@
 from __future__ import annotations
 
 import os
+import shutil
+import tempfile
+import unittest
 from pathlib import Path
+from unittest import mock
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 TESTS_DIR = PROJECT_ROOT / "Tests"
@@ -112,3 +116,21 @@ def get_shared_workspace() -> Path:
     # Ensure env var is always set for consumers
     os.environ[ENV_VAR] = str(BASE_WORKSPACE_DIR)
     return BASE_WORKSPACE_DIR
+
+
+def isolate_bcasl_pycache(testcase: unittest.TestCase) -> Path:
+    """Point PYCOMPILER_BCASL_PYCACHE at a temporary directory for one test.
+
+    Keeps plugin bytecode and metadata caches written by throwaway test plugins
+    out of the user cache (~/.cache/pycompiler). Restored on test cleanup.
+    """
+    from bcasl import executor
+
+    cache = Path(tempfile.mkdtemp(prefix="bcasl_pycache_"))
+    patcher = mock.patch.dict(os.environ, {"PYCOMPILER_BCASL_PYCACHE": str(cache)})
+    patcher.start()
+    executor._plugin_pycache_dir.cache_clear()
+    testcase.addCleanup(shutil.rmtree, cache, True)
+    testcase.addCleanup(executor._plugin_pycache_dir.cache_clear)
+    testcase.addCleanup(patcher.stop)
+    return cache
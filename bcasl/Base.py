@@ -16,7 +16,12 @@
 from __future__ import annotations
 
 import fnmatch
+import functools
 import logging
+import os
+import re
+import threading
+from collections import OrderedDict, deque
 from collections.abc import Iterable
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -42,6 +47,317 @@ if not _logger.handlers:
 BCASL_PLUGIN_REGISTER_FUNC = "bcasl_register"
 
 
+@functools.lru_cache(maxsize=256)
+def _compile_globs(patterns: tuple[str, ...]) -> Optional[re.Pattern[str]]:
+    """Compile une liste de motifs fnmatch en une seule alternation regex.
+
+    Un seul `match` par chemin au lieu d'un `fnmatch.fnmatch` par motif.
+    Retourne None si aucun motif.
+    """
+    if not patterns:
+        return None
+    # fnmatch.fnmatch applique os.path.normcase: insensible à la casse sous Windows
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return re.compile(
+        "|".join(f"(?:{fnmatch.translate(p)})" for p in patterns), flags
+    )
+
+
+# Formes d'exclusion courantes traitées sans moteur regex (sémantique fnmatch)
+_LITERAL_RE = re.compile(r"[^*?\[]+\Z")
+_PREFIX_RE = re.compile(r"([^*?\[]+)\*+\Z")  # "venv/**", "build*"
+_SUFFIX_RE = re.compile(r"\*+([^*?\[]+)\Z")  # "*.pyc", "*/setup.py"
+_SUFFIX_ANY_DIR_RE = re.compile(r"\*\*/\*+([^*?\[/]+)\Z")  # "**/*.pyc"
+_SUFFIX_DIR_RE = re.compile(r"\*\*/([^*?\[]+)\Z")  # "**/setup.py"
+_CONTAINS_RE = re.compile(r"\*+([^*?\[]+)\*+\Z")  # "**/__pycache__/**"
+
+
+class _ExcludeMatcher:
+    """Motifs d'exclusion classés: prefix/suffix/contains/literal via méthodes str.
+
+    Un chemin est exclu si un motif correspond au chemin relatif ou au chemin
+    préfixé par la racine (`full`). Les motifs suffix/contains sont testés sur
+    `full` seul: toute correspondance sur le relatif en est aussi une sur `full`.
+    Seuls les motifs réellement glob passent par l'alternation regex.
+    """
+
+    __slots__ = ("fold", "prefixes", "suffixes", "contains", "literals", "regex")
+
+    def __init__(self, patterns: tuple[str, ...]) -> None:
+        # fnmatch.fnmatch applique os.path.normcase: insensible à la casse sous Windows
+        self.fold = os.path.normcase("A") == "a"
+        prefixes: list[str] = []
+        suffixes: list[str] = []
+        contains: list[str] = []
+        literals: set[str] = set()
+        others: list[str] = []
+        for pat in patterns:
+            needle = pat.lower() if self.fold else pat
+            if _LITERAL_RE.match(needle):
+                literals.add(needle)
+            elif m := _PREFIX_RE.match(needle):
+                prefixes.append(m.group(1))
+            elif m := _SUFFIX_ANY_DIR_RE.match(needle) or _SUFFIX_RE.match(needle):
+                suffixes.append(m.group(1))
+            elif m := _SUFFIX_DIR_RE.match(needle):
+                suffixes.append("/" + m.group(1))
+            elif m := _CONTAINS_RE.match(needle):
+                contains.append(m.group(1))
+            else:
+                others.append(pat)
+        self.prefixes = tuple(prefixes)
+        self.suffixes = tuple(suffixes)
+        self.contains = tuple(contains)
+        self.literals = frozenset(literals)
+        self.regex = _compile_globs(tuple(others))
+
+    def match(self, rel: str, full: str) -> bool:
+        if self.fold:
+            rel = rel.lower()
+            full = full.lower()
+        if self.prefixes and (
+            rel.startswith(self.prefixes) or full.startswith(self.prefixes)
+        ):
+            return True
+        if self.suffixes and full.endswith(self.suffixes):
+            return True
+        if rel in self.literals or full in self.literals:
+            return True
+        for needle in self.contains:
+            if needle in full:
+                return True
+        rx = self.regex
+        return rx is not None and (
+            rx.match(rel) is not None or rx.match(full) is not None
+        )
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_excludes(patterns: tuple[str, ...]) -> Optional[_ExcludeMatcher]:
+    """Matcher d'exclusion partagé pour un jeu de motifs; None si aucun motif."""
+    return _ExcludeMatcher(patterns) if patterns else None
+
+
+def _translate_segment(seg: str) -> str:
+    """Traduit un segment glob (sans "/") en regex ne traversant jamais "/"."""
+    out: list[str] = []
+    i, n = 0, len(seg)
+    while i < n:
+        c = seg[i]
+        i += 1
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = seg.find("]", i + 1 if i < n and seg[i] in "!]" else i)
+            if j < 0:
+                out.append("\\[")
+                continue
+            body = seg[i:j].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = j + 1
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+
+def _include_segments(pattern: str) -> list[str]:
+    return [seg for seg in pattern.replace("\\", "/").split("/") if seg]
+
+
+def _translate_include(pattern: str) -> str:
+    """Traduit un motif glob (sémantique pathlib) en regex sur chemin relatif posix.
+
+    - "**" comme segment: zéro ou plusieurs dossiers; en dernier segment, tout
+      fichier sous le préfixe (Path.glob 3.11 n'y renvoyait que des dossiers,
+      écartés ensuite par is_file: "src/**" ne retenait aucun fichier)
+    - "*" / "?" / "[...]": ne traversent jamais "/"
+    """
+    segments = _include_segments(pattern)
+    out: list[str] = []
+    for idx, seg in enumerate(segments):
+        last = idx == len(segments) - 1
+        if seg == "**":
+            out.append(".*" if last else "(?:[^/]+/)*")
+            continue
+        out.append(_translate_segment(seg))
+        if not last:
+            out.append("/")
+    return "".join(out) + r"\Z"
+
+
+def _translate_include_dirs(pattern: str) -> Optional[str]:
+    """Regex des dossiers (relatifs, terminés par "/") qu'un motif peut atteindre.
+
+    "src/*/x.py" n'autorise que "src/" et "src/<d>/"; dès qu'un "**" apparaît,
+    tout dossier sous le préfixe littéral est autorisé. None: seuls les fichiers
+    de la racine peuvent correspondre (ex: "*.toml").
+    """
+    segments = _include_segments(pattern)
+    dir_segments = segments if segments[-1:] == ["**"] else segments[:-1]
+    if not dir_segments:
+        return None
+    out: list[str] = []
+    opened = 0
+    for idx, seg in enumerate(dir_segments):
+        if seg == "**":
+            out.append(".*")
+            break
+        if idx:
+            out.append("(?:")
+            opened += 1
+        out.append(_translate_segment(seg) + "/")
+    return "".join(out) + ")?" * opened + r"\Z"
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_include_globs(patterns: tuple[str, ...]) -> Optional[re.Pattern[str]]:
+    """Compile les motifs d'inclusion (pathlib) en une alternation regex.
+
+    Les motifs invalides sont ignorés (comme le faisait Path.glob).
+    """
+    parts: list[str] = []
+    for pat in patterns:
+        try:
+            rx = _translate_include(pat)
+            re.compile(rx)
+        except (re.error, ValueError):
+            continue
+        parts.append(f"(?:{rx})")
+    if not parts:
+        return None
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return re.compile("|".join(parts), flags)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_include_dirs(patterns: tuple[str, ...]) -> re.Pattern[str]:
+    """Dossiers à descendre pour les motifs d'inclusion (voir _translate_include_dirs).
+
+    Le parcours n'entre que dans les dossiers qu'un motif peut atteindre, comme
+    Path.glob; aucun dossier si aucun motif ne traverse de dossier.
+    """
+    parts: list[str] = []
+    for pat in patterns:
+        try:
+            rx = _translate_include_dirs(pat)
+            if rx is None:
+                continue
+            re.compile(rx)
+        except (re.error, ValueError):
+            continue
+        parts.append(f"(?:{rx})")
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return re.compile("|".join(parts) if parts else r"(?!)", flags)
+
+
+# Cache partagé des parcours iter_files entre instances de PreCompileContext.
+# clé (racine, include, exclude) -> (mtimes des dossiers parcourus, chemins str)
+# FIFO borné; une entrée n'est servie que si aucun dossier parcouru n'a changé.
+_FS_CACHE_MAX = 32
+_FS_CACHE: OrderedDict[
+    tuple[str, tuple[str, ...], tuple[str, ...]],
+    tuple[tuple[tuple[str, int], ...], tuple[str, ...]],
+] = OrderedDict()
+_FS_CACHE_LOCK = threading.Lock()
+
+
+def _options_of(config: Any) -> dict[str, Any]:
+    """Section "options" d'une config BCASL, sans copie ({} si absente/invalide)."""
+    if isinstance(config, dict):
+        opts = config.get("options")
+        if isinstance(opts, dict):
+            return opts
+    return {}
+
+
+def invalidate_fs_cache() -> None:
+    """Vide le cache partagé des parcours de fichiers (hôtes en mode watch)."""
+    with _FS_CACHE_LOCK:
+        _FS_CACHE.clear()
+
+
+def _fs_cache_get(key) -> Optional[tuple[str, ...]]:
+    with _FS_CACHE_LOCK:
+        entry = _FS_CACHE.get(key)
+    if entry is None:
+        return None
+    dir_mtimes, files = entry
+    try:
+        for d, mtime in dir_mtimes:
+            if os.stat(d).st_mtime_ns != mtime:
+                break
+        else:
+            return files
+    except OSError:
+        pass
+    with _FS_CACHE_LOCK:
+        _FS_CACHE.pop(key, None)
+    return None
+
+
+def _fs_cache_put(key, dir_mtimes: list[tuple[str, int]], files: list[str]) -> None:
+    with _FS_CACHE_LOCK:
+        _FS_CACHE[key] = (tuple(dir_mtimes), tuple(files))
+        while len(_FS_CACHE) > _FS_CACHE_MAX:
+            _FS_CACHE.popitem(last=False)
+
+
+def _walk(
+    root: Path,
+    include_re: re.Pattern[str],
+    exclude: Optional[_ExcludeMatcher],
+    prune: Optional[_ExcludeMatcher],
+    dir_mtimes: Optional[list[tuple[str, int]]] = None,
+    descend_re: Optional[re.Pattern[str]] = None,
+) -> Iterable[str]:
+    """Parcourt `root` via os.scandir et yield les chemins (str) des fichiers retenus.
+
+    Les motifs d'exclusion sont testés sur le chemin relatif et sur le chemin
+    préfixé par la racine; les dossiers couverts par un motif d'exclusion
+    terminé par "*" (ex: "venv/**") ne sont jamais descendus, pas plus que
+    ceux que `descend_re` (voir _compile_include_dirs) ne retient pas.
+    Si `dir_mtimes` est fourni, y ajoute (dossier, st_mtime_ns) de chaque
+    dossier parcouru (empreinte pour le cache partagé).
+    """
+    base = os.fspath(root)
+    prefix = root.as_posix().rstrip("/") + "/"
+
+    def excluded(matcher: Optional[_ExcludeMatcher], rel: str) -> bool:
+        return matcher is not None and matcher.match(rel, prefix + rel)
+
+    pending: deque[tuple[str, str]] = deque([("", base)])
+    while pending:
+        rel_dir, abs_dir = pending.popleft()
+        try:
+            if dir_mtimes is not None:
+                dir_mtimes.append((abs_dir, os.stat(abs_dir).st_mtime_ns))
+            with os.scandir(abs_dir) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            rel = rel_dir + entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    rel_d = rel + "/"
+                    if (
+                        descend_re is None or descend_re.match(rel_d) is not None
+                    ) and not excluded(prune, rel_d):
+                        pending.append((rel_d, entry.path))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if include_re.match(rel) is None or excluded(exclude, rel):
+                continue
+            yield entry.path
+
+
 @dataclass(frozen=True)
 class PluginMeta:
     """Métadonnées d'un plugin.
@@ -113,6 +429,9 @@ class BcPluginBase:
     meta: PluginMeta
     requires: tuple[str, ...]
     priority: int
+    # True: exécuté dans un thread du processus courant même en mode sandbox
+    # (plugin sûr, sans isolation nécessaire; voir register_plugin(inproc=True))
+    inproc: bool = False
 
     def __init__(
         self, meta: PluginMeta, requires: Iterable[str] = (), priority: int = 100
@@ -366,7 +685,7 @@ class PreCompileContext:
     project_root: Path
     config: dict[str, Any] = field(default_factory=dict)
     workspace_metadata: dict[str, Any] = field(default_factory=dict)
-    _iter_cache: dict[tuple[tuple[str, ...], tuple[str, ...]], list[Path]] = field(
+    _iter_cache: dict[tuple[tuple[str, ...], tuple[str, ...]], list[str]] = field(
         default_factory=dict, repr=False, compare=False
     )
 
@@ -457,22 +776,30 @@ class PreCompileContext:
         - include: motifs type glob (ex: "**/*.py", "src/**/*.c")
         - exclude: motifs à exclure (ex: "venv/**", "**/__pycache__/**")
         Optimisé: évite la création de grosses listes; yield au fil de l'eau.
+        Les Path sont construits à la volée au-dessus de iter_paths().
+        """
+        for path in self.iter_paths(include, exclude):
+            yield Path(path)
+
+    def iter_paths(
+        self, include: Iterable[str], exclude: Iterable[str] = ()
+    ) -> Iterable[str]:
+        """Variante de iter_files qui yield des chemins str (forme os.fspath).
+
+        Mêmes motifs et même cache que iter_files, sans allouer de Path:
+        à préférer pour les gros arbres quand le plugin passe les chemins
+        directement à open(), os.stat(), etc.
         """
         root = self.project_root
         inc = tuple(include) if include else ("**/*",)
         exc = tuple(exclude) if exclude else tuple()
-        
+
         # Déterminer si le cache est activé
         try:
-            opt = (
-                dict(self.config or {}).get("options", {})
-                if isinstance(self.config, dict)
-                else {}
-            )
-            enable_cache = bool(opt.get("iter_files_cache", True))
+            enable_cache = bool(_options_of(self.config).get("iter_files_cache", True))
         except Exception:
             enable_cache = True
-        
+
         # Créer une clé de cache cohérente (patterns normalisés et triés)
         cache_key = None
         if enable_cache:
@@ -486,32 +813,32 @@ class PreCompileContext:
             except Exception:
                 enable_cache = False
 
-        # Fonction pour vérifier si un chemin doit être exclu
-        def is_excluded(p: Path) -> bool:
-            s = p.as_posix()
-            for pat in exc:
-                if fnmatch.fnmatch(s, pat):
-                    return True
-            return False
+        # Cache partagé entre contextes (builds successifs, plugins non sandboxés)
+        fs_key = None
+        if enable_cache and cache_key is not None:
+            fs_key = (root.as_posix(),) + cache_key
+            shared = _fs_cache_get(fs_key)
+            if shared is not None:
+                collected = list(shared)
+                self._iter_cache[cache_key] = collected
+                yield from collected
+                return
+
+        # Motifs compilés une seule fois (partagés entre plugins)
+        inc_re = _compile_include_globs(inc)
+        exc_m = _compile_excludes(exc)
+        prune_m = _compile_excludes(tuple(p for p in exc if p.endswith("*")))
+
+        collected: list[str] = []
+        dir_mtimes: Optional[list[tuple[str, int]]] = [] if fs_key is not None else None
+        if inc_re is not None:
+            dirs_re = _compile_include_dirs(inc)
+            for path in _walk(root, inc_re, exc_m, prune_m, dir_mtimes, dirs_re):
+                collected.append(path)
+                yield path
+        if fs_key is not None:
+            _fs_cache_put(fs_key, dir_mtimes, collected)
 
-        # Collecter les fichiers avec déduplication (utiliser un set pour éviter les doublons)
-        seen: set[Path] = set()
-        collected: list[Path] = []
-        
-        for pat in inc:
-            try:
-                for path in root.glob(pat):
-                    if path.is_file() and not is_excluded(path):
-                        # Utiliser le chemin résolu pour la déduplication
-                        resolved = path.resolve()
-                        if resolved not in seen:
-                            seen.add(resolved)
-                            collected.append(path)
-                            yield path
-            except (OSError, ValueError):
-                # Ignorer les patterns invalides ou les erreurs d'accès
-                continue
-        
         # Mettre en cache le résultat si activé
         if enable_cache and cache_key is not None:
             try:
@@ -520,7 +847,7 @@ class PreCompileContext:
                 pass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExecutionItem:
     plugin_id: str
     name: str
@@ -529,24 +856,48 @@ class ExecutionItem:
     error: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionReport:
     """Rapport d'exécution agrégé après run_pre_compile."""
 
     items: list[ExecutionItem] = field(default_factory=list)
+    # Agrégats courants (nb items comptés, succès, durée cumulée), complétés
+    # seulement pour les items ajoutés depuis le dernier appel (voir _totals)
+    _tally: tuple[int, int, float] = field(
+        default=(0, 0, 0.0), init=False, repr=False, compare=False
+    )
 
     def add(self, item: ExecutionItem) -> None:
         self.items.append(item)
 
+    def extend(self, items: Iterable[ExecutionItem]) -> None:
+        """Ajoute un lot d'items en un seul appel (vidage par réveil du planificateur)."""
+        self.items.extend(items)
+
+    def _totals(self) -> tuple[int, int, float]:
+        """(total, succès, durée cumulée); seuls les items nouveaux sont parcourus.
+
+        items est en ajout seul: si la liste a rétréci, le décompte repart de zéro.
+        """
+        items = self.items
+        n, ok, dur = self._tally
+        if n != len(items):
+            if n > len(items):
+                n, ok, dur = 0, 0, 0.0
+            for i in items[n:] if n else items:
+                ok += i.success
+                dur += i.duration_ms
+            self._tally = n, ok, dur = len(items), ok, dur
+        return n, ok, dur
+
     @property
     def ok(self) -> bool:
-        return all(i.success for i in self.items)
+        total, ok, _ = self._totals()
+        return ok == total
 
     def summary(self) -> str:
-        total = len(self.items)
-        ok = sum(1 for i in self.items if i.success)
+        total, ok, dur = self._totals()
         ko = total - ok
-        dur = sum(i.duration_ms for i in self.items)
         return f"Plugins: {ok}/{total} ok, {ko} échec(s), temps total {dur:.1f} ms"
 
     def __iter__(self):
@@ -558,24 +909,45 @@ class _PluginRecord:
         "plugin",
         "active",
         "requires",
+        "requires_set",
         "priority",
         "order",
         "insert_idx",
         "module_path",
+        "module_path_str",
         "module_name",
+        "plugin_attr_name",
     )
 
     def __init__(self, plugin: BcPluginBase, insert_idx: int) -> None:
         self.plugin = plugin
         self.active = True
         self.requires = tuple(plugin.requires)
+        self.requires_set = frozenset(self.requires)
         self.priority = plugin.priority
         self.order = 0  # calculé
         self.insert_idx = insert_idx
         self.module_path: Optional[Path] = None
+        # str(module_path) calculé une fois à la découverte (lancement sandbox)
+        self.module_path_str: Optional[str] = None
         self.module_name: Optional[str] = None
+        # Attribut du module portant l'instance (évite le fallback bcasl_register en sandbox)
+        self.plugin_attr_name: Optional[str] = None
+
+
+def register_plugin(cls: Any = None, *, inproc: bool = False) -> Any:
+    """Marque une classe de plugin; @register_plugin ou @register_plugin(inproc=True).
+
+    inproc=True dispense le plugin du processus sandbox: il s'exécute dans un
+    thread du processus courant, comme les plugins de `trusted_plugins`.
+    """
 
+    def _mark(c: Any) -> Any:
+        setattr(c, "__bcasl_plugin__", True)
+        if inproc:
+            c.inproc = True
+        return c
 
-def register_plugin(cls: Any) -> Any:
-    setattr(cls, "__bcasl_plugin__", True)
-    return cls
+    if cls is None:
+        return _mark
+    return _mark(cls)
@@ -28,16 +28,32 @@ Objectifs de simplification:
 """
 from __future__ import annotations
 
+import ast
+import copy
+import hashlib
+import json
+import math
+import operator
 import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional, Sequence
 import yaml
 
-from .executor import BCASL
+from .executor import BCASL, _package_stamp, _plugin_pycache_dir
 
 from .Base import PreCompileContext
 from .tagging import compute_tag_order
 
+# Racine du dépôt et dossier des plugins, invariants pour la durée du processus
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_API_DIR = _REPO_ROOT / "Plugins"
+
+# libyaml (C) si PyYAML a été compilé avec, sinon implémentation pure Python
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 # Qt (facultatif). Ne pas importer QtWidgets au niveau module pour compatibilité headless.
 try:  # pragma: no cover
     from PySide6.QtCore import QObject, QThread, Signal, Slot, Qt
@@ -51,46 +67,278 @@ except Exception:  # pragma: no cover
 # --- Utilitaires ---
 
 
-def _has_bcasl_marker(pkg_dir: Path) -> bool:
+def _plugin_package_entries(api_dir: Path) -> list[os.DirEntry]:
+    """Packages de api_dir (dossiers avec __init__.py) triés par nom.
+
+    Un seul scandir: le type de chaque entrée vient du listage, seul
+    __init__.py coûte un stat.
+    """
+    with os.scandir(api_dir) as it:
+        entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+    return [e for e in entries if os.path.isfile(os.path.join(e.path, "__init__.py"))]
+
+
+# Métadonnées découvertes par dossier de plugins: str(api_dir) -> (signature, meta)
+_META_CACHE: dict[str, tuple[list, dict[str, dict[str, Any]]]] = {}
+# Ordre par tags par dossier de plugins: realpath(api_dir) -> (signature, ordre),
+# toujours issu de la découverte complète (voir _cached_tag_order)
+_ORDER_CACHE: dict[str, tuple[list, list[str]]] = {}
+
+
+def _meta_signature(api_dir: Path) -> list:
+    """Signature du dossier: [nom, *_package_stamp] de chaque package.
+
+    Même empreinte que le cache de modules de l'exécuteur: un PluginMeta ou
+    des tags définis dans un sous-module invalident aussi les métadonnées.
+    """
+    return [
+        [entry.name, *_package_stamp(Path(entry.path))]
+        for entry in _plugin_package_entries(api_dir)
+    ]
+
+
+def _meta_cache_file(api_dir: Path) -> Optional[str]:
+    """Fichier de cache persistant (dossier du bytecode des plugins); None si désactivé."""
+    cache_dir = _plugin_pycache_dir()
+    if cache_dir is None:
+        return None
+    digest = hashlib.sha1(os.path.abspath(api_dir).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"meta_{digest[:20]}.json")
+
+
+# Fichier "dropin" par package: métadonnées lisibles sans importer le plugin
+_DROPIN_NAME = ".bcasl_meta.json"
+# Version du format des métadonnées persistées (dropins et meta_*.json): à
+# incrémenter dès que les champs produits par _scan_bcasl_meta changent
+_META_SCHEMA = 1
+
+
+def _refresh_meta_requested() -> bool:
+    """PYCOMPILER_BCASL_REFRESH_META=1: ignorer les caches et réimporter les plugins."""
+    return os.environ.get("PYCOMPILER_BCASL_REFRESH_META", "").strip() in (
+        "1",
+        "true",
+        "yes",
+    )
+
+
+def _dropin_stamp(pkg_dir: Path) -> list[int]:
+    return list(_package_stamp(pkg_dir))
+
+
+def _read_dropin(pkg_dir: Path) -> Optional[list[dict[str, Any]]]:
+    """Métadonnées du dropin de pkg_dir si aucun module du package n'a changé depuis.
+
+    Le dropin mémorise l'empreinte _package_stamp (mtime_ns le plus récent,
+    nombre de .py): comparaison exacte, sous-modules compris.
+    """
     try:
-        return (pkg_dir / "__init__.py").exists()
+        with open(pkg_dir / _DROPIN_NAME, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("v") != _META_SCHEMA or data.get("stamp") != _dropin_stamp(pkg_dir):
+            return None
+        entries = data["plugins"]
+        if all(isinstance(m, dict) and m.get("id") for m in entries):
+            return entries
     except Exception:
-        return False
+        pass
+    return None
+
+
+def _write_dropin(pkg_dir: Path, entries: list[dict[str, Any]]) -> None:
+    """Écrit le dropin de pkg_dir (best-effort: package en lecture seule ignoré)."""
+    try:
+        data = {"v": _META_SCHEMA, "stamp": _dropin_stamp(pkg_dir), "plugins": entries}
+        tmp = pkg_dir / f"{_DROPIN_NAME}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, pkg_dir / _DROPIN_NAME)
+    except Exception:
+        pass
+
+
+def _read_meta_static(init_py: Path) -> list[dict[str, Any]]:
+    """Extrait id et tags des appels PluginMeta(...) de init_py sans l'exécuter.
+
+    Seules les affectations de premier niveau à arguments littéraux sont
+    retenues; retourne [] si le fichier ne se prête pas à l'analyse statique.
+    """
+    try:
+        data = init_py.read_bytes()
+        # Préfiltre en C: sans le nom PluginMeta, inutile de construire l'AST
+        if b"PluginMeta" not in data:
+            return []
+        tree = ast.parse(data, filename=str(init_py))
+    except Exception:
+        return []
+    entries: list[dict[str, Any]] = []
+    for node in tree.body:
+        value = getattr(node, "value", None)
+        if not isinstance(node, (ast.Assign, ast.AnnAssign)) or not isinstance(
+            value, ast.Call
+        ):
+            continue
+        func = value.func
+        fname = (
+            func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", "")
+        )
+        if fname != "PluginMeta":
+            continue
+        kw = {k.arg: k.value for k in value.keywords if k.arg in ("id", "tags")}
+        try:
+            pid = ast.literal_eval(kw["id"])
+            tags = ast.literal_eval(kw["tags"]) if "tags" in kw else []
+        except Exception:
+            return []
+        if not isinstance(pid, str) or not pid or not isinstance(tags, (list, tuple)):
+            return []
+        entries.append({"id": pid, "tags": [str(t) for t in tags]})
+    return entries
+
+
+def _static_tag_meta(api_dir: Path) -> Optional[dict[str, dict[str, Any]]]:
+    """Tags de chaque plugin sans import: dropin à jour, sinon analyse AST.
+
+    Retourne None dès qu'un package reste indéterminé (l'appelant retombe
+    alors sur la découverte complète).
+    """
+    meta_map: dict[str, dict[str, Any]] = {}
+    try:
+        entries = _plugin_package_entries(api_dir)
+    except Exception:
+        return None
+    for entry in entries:
+        pkg_dir = Path(entry.path)
+        found = _read_dropin(pkg_dir) or _read_meta_static(pkg_dir / "__init__.py")
+        if not found:
+            return None
+        for m in found:
+            meta_map[m["id"]] = {"tags": m.get("tags") or []}
+    return meta_map
 
 
 def _discover_bcasl_meta(api_dir: Path) -> dict[str, dict[str, Any]]:
     """Découvre les plugins en important chaque package et en appelant bcasl_register(manager).
     Retourne un mapping plugin_id -> meta dict {id, name, version, description, author, requirements}
+
+    Résultat mis en cache (mémoire puis disque) tant que la signature du dossier
+    ne change pas: les découvertes suivantes n'importent aucun plugin. Sinon,
+    chaque package à jour est lu depuis son dropin (.bcasl_meta.json).
     """
+    try:
+        sig = _meta_signature(api_dir)
+    except OSError:
+        return {}
+    key = str(api_dir)
+    refresh = _refresh_meta_requested()
+    cached = None if refresh else _META_CACHE.get(key)
+    if cached is None and not refresh:
+        cache_file = _meta_cache_file(api_dir)
+        if cache_file is not None:
+            try:
+                with open(cache_file, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("v") == _META_SCHEMA:
+                    cached = (data["sig"], data["meta"])
+            except Exception:
+                cached = None
+    if cached is not None and cached[0] == sig:
+        _META_CACHE[key] = cached
+        return {pid: dict(m) for pid, m in cached[1].items()}
+    meta = _scan_bcasl_meta(api_dir, refresh)
+    # Signature d'avant le scan: les dropins (.json) n'en font pas partie
+    _META_CACHE[key] = (sig, meta)
+    cache_file = _meta_cache_file(api_dir)
+    if cache_file is not None:
+        try:
+            tmp = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"v": _META_SCHEMA, "sig": sig, "meta": meta}, f)
+            os.replace(tmp, cache_file)
+        except Exception:
+            pass
+    return {pid: dict(m) for pid, m in meta.items()}
+
+
+def _scan_bcasl_meta(api_dir: Path, refresh: bool = False) -> dict[str, dict[str, Any]]:
+    """Dropins à jour, sinon import effectif du package (voir _discover_bcasl_meta)."""
     meta: dict[str, dict[str, Any]] = {}
     try:
         import importlib.util as _ilu
         import sys as _sys
 
-        for pkg_dir in sorted(api_dir.iterdir(), key=lambda p: p.name):
+        # Modules importés pour la seule lecture des métadonnées: retirés de
+        # sys.modules en fin de scan (seul _META_CACHE en garde une trace)
+        imported: set[str] = set()
+
+        pkg_dirs = [Path(entry.path) for entry in _plugin_package_entries(api_dir)]
+
+        def _import(pkg_dir: Path) -> Any:
             try:
-                if not pkg_dir.is_dir():
-                    continue
-                init_py = pkg_dir / "__init__.py"
-                if not init_py.exists():
-                    continue
                 mod_name = f"bcasl_meta_{pkg_dir.name}"
                 spec = _ilu.spec_from_file_location(
-                    mod_name, str(init_py), submodule_search_locations=[str(pkg_dir)]
+                    mod_name,
+                    str(pkg_dir / "__init__.py"),
+                    submodule_search_locations=[str(pkg_dir)],
                 )
                 if spec is None or spec.loader is None:
-                    continue
+                    return None
                 module = _ilu.module_from_spec(spec)
+                imported.add(mod_name)
                 _sys.modules[mod_name] = module
                 spec.loader.exec_module(module)  # type: ignore[attr-defined]
+                return module
+            except Exception:
+                return None
+
+        def _load(pkg_dir: Path) -> tuple[Optional[list[dict[str, Any]]], Any]:
+            """(dropin à jour, None), sinon (None, module importé)."""
+            dropin = None if refresh else _read_dropin(pkg_dir)
+            if dropin is not None:
+                return dropin, None
+            return None, _import(pkg_dir)
+
+        # Phase 1: lecture des dropins et imports (disque + exécution), tous
+        # indépendants: en parallèle à partir de quelques packages, comme
+        # BCASL.load_plugins_from_directory
+        if len(pkg_dirs) >= 4:
+            with ThreadPoolExecutor(max_workers=min(8, len(pkg_dirs))) as tpe:
+                results = list(tpe.map(_load, pkg_dirs))
+        else:
+            results = [_load(pkg_dir) for pkg_dir in pkg_dirs]
+        slots = [(pkg_dir, res[0]) for pkg_dir, res in zip(pkg_dirs, results)]
+        modules = {pkg_dir: res[1] for pkg_dir, res in zip(pkg_dirs, results)}
+
+        # Phase 2: enregistrement séquentiel (bcasl_register) dans l'ordre trié,
+        # sur un seul gestionnaire temporaire partagé par tous les packages
+        mgr: Any = None
+        for pkg_dir, dropin in slots:
+            try:
+                if dropin is not None:
+                    for m in dropin:
+                        meta[m["id"]] = m
+                    continue
+                module = modules.get(pkg_dir)
+                if module is None:
+                    continue
                 reg = getattr(module, "bcasl_register", None)
                 if not callable(reg):
                     continue
-                # Utilise un gestionnaire temporaire pour enregistrer et lire les métadonnées
-                mgr = BCASL(api_dir, config={}, sandbox=False, plugin_timeout_s=0.0)  # type: ignore[call-arg]
-                reg(mgr)
-                # Récupère les plugins enregistrés
-                for pid, rec in getattr(mgr, "_registry", {}).items():
+                if mgr is None:
+                    mgr = BCASL(api_dir, config={}, sandbox=False, plugin_timeout_s=0.0)  # type: ignore[call-arg]
+                registry = mgr._registry
+                before = len(registry)
+                try:
+                    reg(mgr)
+                except Exception:
+                    # Package ignoré: retirer ce qu'il a pu enregistrer avant l'échec
+                    for pid in list(registry)[before:]:
+                        registry.pop(pid, None)
+                    raise
+                # Récupère les plugins enregistrés par ce package (ordre d'insertion)
+                entries: list[dict[str, Any]] = []
+                for pid in list(registry)[before:]:
+                    rec = registry[pid]
                     try:
                         plg = rec.plugin
                         # Récupérer les tags depuis PluginMeta (normalisés)
@@ -140,37 +388,331 @@ def _discover_bcasl_meta(api_dir: Path) -> dict[str, dict[str, Any]]:
                             "requirements": reqs,
                         }
                         meta[plg.meta.id] = m
+                        entries.append(m)
                     except Exception:
                         continue
+                _write_dropin(pkg_dir, entries)
             except Exception:
                 continue
+
+        # Chaque itération absorbe ses erreurs: ce nettoyage est toujours atteint
+        if imported:
+            for key in list(_sys.modules):
+                if key.partition(".")[0] in imported:
+                    _sys.modules.pop(key, None)
     except Exception:
         pass
     return meta
 
 
+def _registry_tag_meta(manager: Any, api_dir: Path) -> dict[str, dict[str, Any]]:
+    """Tags des plugins déjà chargés par manager (repli: _discover_bcasl_meta).
+
+    Suffit à compute_tag_order, sans second passage d'import des packages.
+    """
+    registry = getattr(manager, "_registry", None)
+    if not registry:
+        return _discover_bcasl_meta(api_dir)
+    meta: dict[str, dict[str, Any]] = {}
+    for pid, rec in registry.items():
+        tags: list[str] = []
+        try:
+            meta_tags = getattr(rec.plugin.meta, "tags", ())
+            if isinstance(meta_tags, (list, tuple)):
+                tags = [str(x).strip().lower() for x in meta_tags if str(x).strip()]
+        except Exception:
+            tags = []
+        meta[pid] = {"id": pid, "tags": tags}
+    return meta
+
+
+def _cached_tag_order(
+    api_dir: Path,
+    meta_fn: Callable[[], dict[str, dict[str, Any]]],
+    store: bool = True,
+) -> list[str]:
+    """compute_tag_order(meta_fn()) mémoïsé tant que la signature de api_dir ne change pas.
+
+    Un ordre vide n'est pas mémoïsé (découverte en échec, dossier vide).
+    store=False pour une source partielle (registre sans les packages
+    désactivés): l'ordre mémoïsé sert s'il existe, mais n'est jamais remplacé.
+    """
+    key = os.path.realpath(api_dir)
+    try:
+        sig = _meta_signature(api_dir)
+    except OSError:
+        sig = None
+    cached = _ORDER_CACHE.get(key)
+    if sig is not None and cached is not None and cached[0] == sig:
+        return list(cached[1])
+    order = compute_tag_order(meta_fn())
+    if order and store and sig is not None:
+        # Signature d'avant la découverte: un plugin modifié entre-temps
+        # invalidera l'entrée au prochain appel
+        _ORDER_CACHE[key] = (sig, order)
+    return list(order)
+
+
+def _entry_priority(val: Any) -> Optional[int]:
+    """Priorité explicite d'une entrée de plugin, ou None si absente/invalide.
+
+    Accepte entiers, flottants finis et chaînes entières ("3", "-2"), comme
+    l'ancien int(); les autres valeurs sont ignorées sans lever d'exception.
+    """
+    if isinstance(val, int):
+        return int(val)
+    if isinstance(val, float):
+        return int(val) if math.isfinite(val) else None
+    if isinstance(val, str):
+        text = val.strip()
+        digits = text[1:] if text[:1] in ("+", "-") else text
+        if digits.isdecimal():
+            return int(text)
+    return None
+
+
+def _entry_enabled(val: Any) -> bool:
+    """État d'une entrée cfg["plugins"][pid]: booléen ou {"enabled": ...}."""
+    if isinstance(val, bool):
+        return val
+    if isinstance(val, dict):
+        return bool(val.get("enabled", True))
+    return True
+
+
+def _disabled_packages(api_dir: Path, cfg: Any) -> set[str]:
+    """Packages de api_dir dont tous les plugins sont désactivés dans cfg.
+
+    Correspondance package -> ids lue dans les dropins à jour uniquement (reflet
+    exact du dernier bcasl_register); sans dropin, le package est chargé.
+    """
+    pmap = cfg.get("plugins") if isinstance(cfg, dict) else None
+    if not isinstance(pmap, dict):
+        return set()
+    disabled = {pid for pid, val in pmap.items() if not _entry_enabled(val)}
+    skip: set[str] = set()
+    if not disabled:
+        return skip
+    try:
+        entries = _plugin_package_entries(api_dir)
+    except Exception:
+        return skip
+    for entry in entries:
+        found = _read_dropin(Path(entry.path))
+        if found and all(m["id"] in disabled for m in found):
+            skip.add(entry.name)
+    return skip
+
+
+def _apply_plugin_config(
+    manager: Any, cfg: Any, api_dir: Path, log: Optional[Callable[[str], Any]] = None
+) -> None:
+    """Applique activation et priorités de cfg à manager, une seule passe chacune.
+
+    Priorité finale d'un plugin: son index dans plugin_order (à défaut, ordre
+    par tags), sinon la priorité explicite de cfg["plugins"][pid].
+    """
+    if not isinstance(cfg, dict):
+        cfg = {}
+    pmap = cfg.get("plugins")
+    final_prio: dict[str, int] = {}
+    disabled: set[str] = set()
+    if isinstance(pmap, dict):
+        # Un seul aiguillage par type et par entrée (voir _entry_enabled)
+        for pid, val in pmap.items():
+            if isinstance(val, dict):
+                if not val.get("enabled", True):
+                    disabled.add(pid)
+                prio = _entry_priority(val.get("priority"))
+                if prio is not None:
+                    final_prio[pid] = prio
+            elif val is False:
+                disabled.add(pid)
+    if disabled:
+        try:
+            manager.disable_many(disabled)
+        except Exception:
+            pass
+    # plugin_order lu tel quel (jamais modifié ici): pas de copie
+    raw_order = cfg.get("plugin_order")
+    order_list: Sequence[str] = (
+        raw_order if isinstance(raw_order, (list, tuple)) else ()
+    )
+    if not order_list:
+        try:
+            order_list = _cached_tag_order(
+                api_dir, lambda: _registry_tag_meta(manager, api_dir), store=False
+            )
+        except Exception:
+            order_list = ()
+    for idx, pid in enumerate(order_list):
+        final_prio[pid] = idx
+    try:
+        manager.set_priorities(final_prio)
+    except Exception:
+        pass
+    if order_list and log is not None:
+        try:
+            log(
+                "".join(
+                    f"⏫ Priorité {i} pour {pid}\n" for i, pid in enumerate(order_list)
+                )
+            )
+        except Exception:
+            pass
+
+
+def _resolve_options(cfg: Any) -> tuple[float, bool]:
+    """(timeout effectif des plugins, BCASL activé) d'après cfg et l'environnement.
+
+    Timeout: options.plugin_timeout_s, sinon PYCOMPILER_BCASL_PLUGIN_TIMEOUT
+    (lu seulement dans ce cas); <= 0 => illimité (0.0).
+    """
+    opt = cfg.get("options", {}) if isinstance(cfg, dict) else {}
+    if not isinstance(opt, dict):
+        opt = {}
+    try:
+        timeout = float(opt.get("plugin_timeout_s", 0.0))
+    except Exception:
+        timeout = 0.0
+    if timeout == 0.0:
+        try:
+            timeout = float(os.environ.get("PYCOMPILER_BCASL_PLUGIN_TIMEOUT", "0"))
+        except Exception:
+            timeout = 0.0
+    try:
+        enabled = bool(opt.get("enabled", True))
+    except Exception:
+        enabled = True
+    return (timeout if timeout > 0 else 0.0), enabled
+
+
+def _no_log(_msg: str) -> None:
+    pass
+
+
+def _log_sink(owner: Any) -> Optional[Callable[[str], Any]]:
+    """Résout une fois le append du journal de owner (None si absent)."""
+    log = getattr(owner, "log", None)
+    return log.append if log is not None else None
+
+
+def _load_summary(loaded: int, errors: Any) -> str:
+    """Bilan de chargement en un seul message (une ligne par erreur)."""
+    head = f"🧩 BCASL: {loaded} package(s) chargé(s) depuis Plugins/\n"
+    if not errors:  # cas courant: ni générateur ni jointure
+        return head
+    return head + "".join(f"⚠️ Plugin '{mod}': {msg}\n" for mod, msg in errors)
+
+
+_ITEM_FIELDS = operator.attrgetter("plugin_id", "success", "error", "duration_ms")
+
+
+def _report_text(report: Any) -> str:
+    """Rapport BCASL en un seul bloc: en-tête, une ligne par plugin, résumé.
+
+    Un seul append côté journal Qt au lieu d'un par plugin.
+    """
+    parts = ["BCASL - Rapport:\n"]
+    try:
+        # Champs des ExecutionItem (slots) extraits en C par attrgetter
+        parts += [
+            f" - {pid}: {'OK' if ok else f'FAIL: {err}'} ({ms:.1f} ms)\n"
+            for pid, ok, err, ms in map(_ITEM_FIELDS, report)
+        ]
+    except Exception:
+        pass
+    try:
+        parts.append(report.summary() + "\n")
+    except Exception:
+        pass
+    return "".join(parts)
+
+
+def _write_config_yml(target: Path, cfg: dict[str, Any]) -> bool:
+    """Écrit cfg dans target de façon atomique (fichier temporaire + os.replace).
+
+    Retourne False sans rien écrire si le contenu sérialisé est inchangé.
+    """
+    data = yaml.dump(
+        cfg, Dumper=_YamlDumper, allow_unicode=True, sort_keys=False
+    ).encode("utf-8")
+    try:
+        if target.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    return True
+
+
 # --- Chargement config (JSON uniquement) ---
 
 
+# Config lue depuis bcasl.yml par workspace: str(root) -> (empreinte, config fusionnée)
+_CFG_CACHE: dict[str, tuple[tuple, dict[str, Any]]] = {}
+# Fichiers dont dépend la config fusionnée (bcasl puis ARK, voir load_ark_config)
+_CFG_FILES = (
+    "bcasl.yml",
+    ".bcasl.yml",
+    "ARK_Main_Config.yaml",
+    "ARK_Main_Config.yml",
+    ".ARK_Main_Config.yaml",
+    ".ARK_Main_Config.yml",
+)
+
+
+def _config_stamp(workspace_root: Path) -> tuple:
+    """(mtime_ns, taille) de chaque fichier de config du workspace.
+
+    None si absent ou pas un fichier régulier: l'empreinte tient lieu de sonde
+    d'existence pour la lecture (aucun exists()/is_file() supplémentaire).
+    """
+    stamp = []
+    for name in _CFG_FILES:
+        try:
+            st = os.stat(os.path.join(workspace_root, name))
+        except OSError:
+            stamp.append(None)
+            continue
+        stamp.append((st.st_mtime_ns, st.st_size) if stat.S_ISREG(st.st_mode) else None)
+    return tuple(stamp)
+
+
 def _load_workspace_config(workspace_root: Path) -> dict[str, Any]:
     """Charge bcasl.yml si présent, sinon génère une config par défaut minimale et l'écrit.
 
     Fusionne aussi avec ARK_Main_Config.yml si disponible pour les patterns et options plugins.
     YML ONLY - YAML and JSON files are NOT supported.
+    La config lue est mémoïsée tant que ni bcasl.yml ni la config ARK ne changent.
     """
+    key = str(workspace_root)
+    stamp = _config_stamp(workspace_root)
+    cached = _CFG_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        # Copie: les appelants peuvent modifier la config renvoyée
+        return copy.deepcopy(cached[1])
 
     def _read_yml(p: Path) -> dict[str, Any]:
         try:
-            return yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+            return yaml.load(p.read_text(encoding="utf-8"), Loader=_YamlLoader) or {}
         except Exception:
             return {}
 
     # 1) Fichiers candidats (YML uniquement - NO YAML, NO JSON)
-    # Priorité: bcasl.yml > .bcasl.yml
-    for name in ("bcasl.yml", ".bcasl.yml"):
-        p = workspace_root / name
-        if p.exists() and p.is_file():
-            data = _read_yml(p)
+    # Priorité: bcasl.yml > .bcasl.yml (présence connue via l'empreinte)
+    for name, file_stamp in zip(_CFG_FILES[:2], stamp):
+        if file_stamp is not None:
+            data = _read_yml(workspace_root / name)
 
             if isinstance(data, dict) and data:
                 # Fusionner avec ARK_Main_Config.yml si disponible
@@ -211,28 +753,29 @@ def _load_workspace_config(workspace_root: Path) -> dict[str, Any]:
                 except Exception:
                     pass
 
+                _CFG_CACHE[key] = (stamp, copy.deepcopy(data))
                 return data
 
     # 2) Génération défaut avec fusion ARK
     default_cfg: dict[str, Any] = {}
     try:
-        repo_root = Path(__file__).resolve().parents[1]
-        api_dir = repo_root / "Plugins"
+        api_dir = _API_DIR
         detected_plugins: dict[str, Any] = {}
-        meta_map = _discover_bcasl_meta(api_dir) if api_dir.exists() else {}
-        if meta_map:
-            order = compute_tag_order(meta_map)
+        order: list[str] = []
+        if api_dir.exists():
+            # Ordre par tags sans exécuter les plugins si possible
+            order = _cached_tag_order(
+                api_dir,
+                lambda: _static_tag_meta(api_dir) or _discover_bcasl_meta(api_dir),
+            )
+        if order:
             for idx, pid in enumerate(order):
                 detected_plugins[pid] = {"enabled": True, "priority": idx}
             plugin_order = order
         else:
             # Fallback alphabétique par dossier
             try:
-                names = [
-                    p.name
-                    for p in sorted(api_dir.iterdir())
-                    if (p.is_dir() and _has_bcasl_marker(p))
-                ]
+                names = [e.name for e in _plugin_package_entries(api_dir)]
             except Exception:
                 names = []
             for idx, pid in enumerate(sorted(names)):
@@ -292,20 +835,36 @@ def _load_workspace_config(workspace_root: Path) -> dict[str, Any]:
             "plugins": detected_plugins,
             "plugin_order": plugin_order,
         }
-        # Ecriture best-effort en YML uniquement
-        try:
-            target = workspace_root / "bcasl.yml"
-            target.write_text(
-                yaml.safe_dump(default_cfg, allow_unicode=True, sort_keys=False),
-                encoding="utf-8",
-            )
-        except Exception:
-            pass
+        # Ecriture best-effort en YML uniquement (sauf workspace en lecture seule)
+        written = False
+        if os.access(workspace_root, os.W_OK):
+            try:
+                written = _write_config_yml(workspace_root / "bcasl.yml", default_cfg)
+            except Exception:
+                pass
+        if not written:
+            # Rien d'écrit: défauts mémoïsés tant qu'aucune config n'apparaît
+            _CFG_CACHE[key] = (stamp, copy.deepcopy(default_cfg))
     except Exception:
         pass
     return default_cfg
 
 
+# Même interface que functools.lru_cache (tests, rechargement forcé)
+_load_workspace_config.cache_clear = _CFG_CACHE.clear  # type: ignore[attr-defined]
+
+
+def _workspace_options(workspace_root: Path) -> tuple[float, bool]:
+    """_resolve_options sur la config mémoïsée, sans la copie profonde.
+
+    Pour les appelants qui ne lisent que options (timeout, drapeau enabled).
+    """
+    cached = _CFG_CACHE.get(str(workspace_root))
+    if cached is not None and cached[0] == _config_stamp(workspace_root):
+        return _resolve_options(cached[1])
+    return _resolve_options(_load_workspace_config(workspace_root))
+
+
 # --- Worker et bridge (Qt) ---
 if QObject is not None and Signal is not None:  # pragma: no cover
 
@@ -329,76 +888,35 @@ if QObject is not None and Signal is not None:  # pragma: no cover
         @Slot()
         def run(self) -> None:
             try:
-                manager = BCASL(
+                with BCASL(
                     self.workspace_root,
                     config=self.cfg,
                     plugin_timeout_s=self.plugin_timeout,
-                )
-                loaded, errors = manager.load_plugins_from_directory(self.api_dir)
-                try:
-                    self.log.emit(
-                        f"🧩 BCASL: {loaded} package(s) chargé(s) depuis Plugins/\n"
+                ) as manager:
+                    loaded, errors = manager.load_plugins_from_directory(
+                        self.api_dir, skip=_disabled_packages(self.api_dir, self.cfg)
                     )
-                    for mod, msg in errors or []:
-                        self.log.emit(f"⚠️ Plugin '{mod}': {msg}\n")
-                except Exception:
-                    pass
-                # Activer/désactiver + priorités
-                pmap = self.cfg.get("plugins", {}) if isinstance(self.cfg, dict) else {}
-                if isinstance(pmap, dict):
-                    for pid, val in pmap.items():
-                        try:
-                            enabled = (
-                                val
-                                if isinstance(val, bool)
-                                else bool((val or {}).get("enabled", True))
-                            )
-                            if not enabled:
-                                manager.disable_plugin(pid)
-                        except Exception:
-                            pass
-                        try:
-                            if isinstance(val, dict) and "priority" in val:
-                                manager.set_priority(pid, int(val.get("priority", 0)))
-                        except Exception:
-                            pass
-                order_list = []
-                try:
-                    order_list = (
-                        list(self.cfg.get("plugin_order", []))
-                        if isinstance(self.cfg, dict)
-                        else []
-                    )
-                except Exception:
-                    order_list = []
-                if not order_list:
                     try:
-                        meta_en = _discover_bcasl_meta(self.api_dir)
-                        order_list = list(compute_tag_order(meta_en))
+                        self.log.emit(_load_summary(loaded, errors))
                     except Exception:
-                        order_list = []
-                if order_list:
-                    for idx, pid in enumerate(order_list):
-                        try:
-                            self.log.emit(f"⏫ Priorité {idx} pour {pid}\n")
-                            manager.set_priority(pid, int(idx))
-                        except Exception:
-                            pass
-                # Préparer les métadonnées du workspace
-                workspace_meta = {
-                    "workspace_name": self.workspace_root.name,
-                    "workspace_path": str(self.workspace_root),
-                    "file_patterns": self.cfg.get("file_patterns", []),
-                    "exclude_patterns": self.cfg.get("exclude_patterns", []),
-                    "required_files": self.cfg.get("required_files", []),
-                }
-                report = manager.run_pre_compile(
-                    PreCompileContext(
-                        self.workspace_root, 
-                        config=self.cfg,
-                        workspace_metadata=workspace_meta
+                        pass
+                    # Activer/désactiver + priorités
+                    _apply_plugin_config(manager, self.cfg, self.api_dir, self.log.emit)
+                    # Préparer les métadonnées du workspace
+                    workspace_meta = {
+                        "workspace_name": self.workspace_root.name,
+                        "workspace_path": str(self.workspace_root),
+                        "file_patterns": self.cfg.get("file_patterns", []),
+                        "exclude_patterns": self.cfg.get("exclude_patterns", []),
+                        "required_files": self.cfg.get("required_files", []),
+                    }
+                    report = manager.run_pre_compile(
+                        PreCompileContext(
+                            self.workspace_root,
+                            config=self.cfg,
+                            workspace_metadata=workspace_meta,
+                        )
                     )
-                )
                 self.finished.emit(report)
             except Exception as e:
                 try:
@@ -410,42 +928,54 @@ if QObject is not None and Signal is not None:  # pragma: no cover
 
 if QObject is not None and Signal is not None:  # pragma: no cover
 
+    class _BCASLMetaWorker(QObject):
+        """Découverte des métadonnées de plugins pour la fenêtre BCASL Loader."""
+
+        finished = Signal(object)  # meta_map
+
+        def __init__(self, api_dir: Path) -> None:
+            super().__init__()
+            self.api_dir = api_dir
+
+        @Slot()
+        def run(self) -> None:
+            try:
+                meta_map = _discover_bcasl_meta(self.api_dir)
+            except Exception:
+                meta_map = {}
+            self.finished.emit(meta_map)
+
+    class _BCASLMetaBridge(QObject):
+        """Relaye le résultat de _BCASLMetaWorker dans le thread UI (créé là)."""
+
+        def __init__(self, callback) -> None:
+            super().__init__()
+            self._callback = callback
+
+        @Slot(object)
+        def on_meta(self, meta_map) -> None:
+            self._callback(meta_map)
+
     class _BCASLUiBridge(QObject):
         def __init__(self, gui, on_done, thread) -> None:
             super().__init__()
-            self._gui = gui
+            self._log = _log_sink(gui)
             self._on_done = on_done
             self._thread = thread
 
         @Slot(str)
         def on_log(self, s: str) -> None:
             try:
-                if hasattr(self._gui, "log") and self._gui.log:
-                    self._gui.log.append(s)
+                if self._log is not None:
+                    self._log(s)
             except Exception:
                 pass
 
         @Slot(object)
         def on_finished(self, rep) -> None:
             try:
-                if rep and hasattr(self._gui, "log") and self._gui.log is not None:
-                    self._gui.log.append("BCASL - Rapport:\n")
-                    for item in rep:
-                        try:
-                            state = (
-                                "OK"
-                                if getattr(item, "success", False)
-                                else f"FAIL: {getattr(item, 'error', '')}"
-                            )
-                            dur = getattr(item, "duration_ms", 0.0)
-                            pid = getattr(item, "plugin_id", "?")
-                            self._gui.log.append(f" - {pid}: {state} ({dur:.1f} ms)\n")
-                        except Exception:
-                            pass
-                    try:
-                        self._gui.log.append(rep.summary() + "\n")
-                    except Exception:
-                        pass
+                if rep and self._log is not None:
+                    self._log(_report_text(rep))
                 try:
                     if callable(self._on_done):
                         self._on_done(rep)
@@ -503,26 +1033,7 @@ def resolve_bcasl_timeout(self) -> float:
         if not getattr(self, "workspace_dir", None):
             return 0.0
         workspace_root = Path(self.workspace_dir).resolve()
-        cfg = _load_workspace_config(workspace_root)
-        try:
-            env_timeout = float(os.environ.get("PYCOMPILER_BCASL_PLUGIN_TIMEOUT", "0"))
-        except Exception:
-            env_timeout = 0.0
-        try:
-            opt = cfg.get("options", {}) if isinstance(cfg, dict) else {}
-            cfg_timeout = (
-                float(opt.get("plugin_timeout_s", 0.0))
-                if isinstance(opt, dict)
-                else 0.0
-            )
-        except Exception:
-            cfg_timeout = 0.0
-        plugin_timeout_raw = cfg_timeout if cfg_timeout != 0.0 else env_timeout
-        return (
-            float(plugin_timeout_raw)
-            if plugin_timeout_raw and plugin_timeout_raw > 0
-            else 0.0
-        )
+        return _workspace_options(workspace_root)[0]
     except Exception:
         return 0.0
 
@@ -531,6 +1042,7 @@ def open_bc_loader_dialog(self) -> None:  # UI minimale
     """Fenêtre simple pour activer/désactiver et réordonner les plugins(BCASL).
     Persiste dans <workspace>/bcasl.yml uniquement (YML).
     """
+    log = _log_sink(self)
     try:  # Importer QtWidgets à la demande pour compatibilité headless
         from PySide6.QtWidgets import (
             QAbstractItemView,
@@ -559,8 +1071,7 @@ def open_bc_loader_dialog(self) -> None:  # UI minimale
             )
             return
         workspace_root = Path(self.workspace_dir).resolve()
-        repo_root = Path(__file__).resolve().parents[1]
-        api_dir = repo_root / "Plugins"
+        api_dir = _API_DIR
         if not api_dir.exists():
             QMessageBox.information(
                 self,
@@ -571,20 +1082,10 @@ def open_bc_loader_dialog(self) -> None:  # UI minimale
                 ),
             )
             return
-        meta_map = _discover_bcasl_meta(api_dir)
-        plugin_ids = list(sorted(meta_map.keys()))
-        if not plugin_ids:
-            QMessageBox.information(
-                self,
-                self.tr("Information", "Information"),
-                self.tr(
-                    "Aucun plugin détecté dans Plugins/.",
-                    "No plugins detected in Plugins.",
-                ),
-            )
-            return
         cfg = _load_workspace_config(workspace_root)
-        plugins_cfg = cfg.get("plugins", {}) if isinstance(cfg, dict) else {}
+        if not isinstance(cfg, dict):
+            cfg = {}
+        plugins_cfg = cfg.get("plugins", {})
 
         dlg = QDialog(self)
         dlg.setWindowTitle(self.tr("BCASL LOADER", "BCASL LOADER"))
@@ -600,7 +1101,7 @@ def open_bc_loader_dialog(self) -> None:  # UI minimale
         # Global BCASL enable/disable
         chk_enable = QCheckBox("Activer BCASL / Enable BCASL", dlg)
         try:
-            opt = cfg.get("options", {}) if isinstance(cfg, dict) else {}
+            opt = cfg.get("options", {})
             bcasl_enabled_flag = (
                 bool(opt.get("enabled", True)) if isinstance(opt, dict) else True
             )
@@ -614,89 +1115,125 @@ def open_bc_loader_dialog(self) -> None:  # UI minimale
         lst.setSelectionMode(QAbstractItemView.SingleSelection)
         lst.setDragDropMode(QAbstractItemView.InternalMove)
 
-        # Ordre initial: plugin_order si présent; sinon heuristique par tags; sinon alphabétique
-        order = []
-        try:
-            order = cfg.get("plugin_order", []) if isinstance(cfg, dict) else []
-            order = [pid for pid in order if pid in plugin_ids]
-        except Exception:
+        # Importer les fonctions de tagging pour afficher les phases
+        from .tagging import get_tag_phase_name
+
+        # Découverte hors thread UI: la fenêtre s'affiche aussitôt avec un
+        # placeholder, la liste est remplie à l'arrivée des métadonnées
+        lst.addItem(
+            QListWidgetItem(self.tr("Chargement des plugins…", "Loading plugins…"))
+        )
+
+        def _populate(meta_map: dict[str, dict[str, Any]]) -> None:
+            plugin_ids = list(sorted(meta_map.keys()))
+            if not plugin_ids:
+                dlg.reject()
+                QMessageBox.information(
+                    self,
+                    self.tr("Information", "Information"),
+                    self.tr(
+                        "Aucun plugin détecté dans Plugins/.",
+                        "No plugins detected in Plugins.",
+                    ),
+                )
+                return
+            # Ordre initial: plugin_order si présent; sinon heuristique par tags; sinon alphabétique
             order = []
-        if not order:
             try:
-                order = [
-                    pid for pid in compute_tag_order(meta_map) if pid in plugin_ids
-                ]
+                order = cfg.get("plugin_order", [])
+                order = [pid for pid in order if pid in plugin_ids]
             except Exception:
-                order = sorted(plugin_ids)
+                order = []
+            if not order:
+                try:
+                    order = [
+                        pid for pid in compute_tag_order(meta_map) if pid in plugin_ids
+                    ]
+                except Exception:
+                    order = sorted(plugin_ids)
 
-        remaining = [pid for pid in plugin_ids if pid not in order]
-        ordered_ids = order + remaining
+            remaining = [pid for pid in plugin_ids if pid not in order]
+            ordered_ids = order + remaining
 
-        # Importer les fonctions de tagging pour afficher les phases
-        from .tagging import get_tag_phase_name
+            # Items construits hors de la vue, puis insérés en un seul lot
+            items = []
+            for pid in ordered_ids:
+                meta = meta_map.get(pid, {})
+                label = meta.get("name") or pid
+                ver = meta.get("version") or ""
+                tags = meta.get("tags") or []
 
-        for pid in ordered_ids:
-            meta = meta_map.get(pid, {})
-            label = meta.get("name") or pid
-            ver = meta.get("version") or ""
-            tags = meta.get("tags") or []
-
-            # Déterminer la phase d'exécution
-            phase_name = ""
-            if tags:
-                # Utiliser le premier tag pour déterminer la phase
-                phase_name = get_tag_phase_name(tags[0])
-
-            # Construire le texte avec la phase
-            text = f"{label} ({pid})" + (f" v{ver}" if ver else "")
-            if phase_name:
-                text += f" [Phase: {phase_name}]"
-
-            item = QListWidgetItem(text)
-            # Tooltip avec description, tags et requirements
-            try:
-                desc = meta.get("description") or ""
-                tooltip = desc
+                # Déterminer la phase d'exécution
+                phase_name = ""
                 if tags:
-                    tooltip += f"\n\nTags: {', '.join(tags)}"
+                    # Utiliser le premier tag pour déterminer la phase
+                    phase_name = get_tag_phase_name(tags[0])
 
-                # Ajouter les requirements du plugin depuis meta_map
-                reqs = meta.get("requirements", [])
-                if reqs:
-                    tooltip += f"\n\nRequirements:\n" + "\n".join(
-                        f"  • {req}" for req in reqs
-                    )
+                # Construire le texte avec la phase
+                text = f"{label} ({pid})" + (f" v{ver}" if ver else "")
+                if phase_name:
+                    text += f" [Phase: {phase_name}]"
 
-                if tooltip:
-                    item.setToolTip(tooltip)
-            except Exception:
-                pass
-            # Etat
-            enabled = True
+                item = QListWidgetItem(text)
+                # Tooltip avec description, tags et requirements
+                try:
+                    desc = meta.get("description") or ""
+                    tooltip = desc
+                    if tags:
+                        tooltip += f"\n\nTags: {', '.join(tags)}"
+
+                    # Ajouter les requirements du plugin depuis meta_map
+                    reqs = meta.get("requirements", [])
+                    if reqs:
+                        tooltip += f"\n\nRequirements:\n" + "\n".join(
+                            f"  • {req}" for req in reqs
+                        )
+
+                    if tooltip:
+                        item.setToolTip(tooltip)
+                except Exception:
+                    pass
+                # Etat
+                enabled = True
+                try:
+                    pentry = plugins_cfg.get(pid, {})
+                    if isinstance(pentry, dict):
+                        enabled = bool(pentry.get("enabled", True))
+                    elif isinstance(pentry, bool):
+                        enabled = pentry
+                except Exception:
+                    pass
+                try:
+                    item.setData(0x0100, pid)
+                except Exception:
+                    pass
+                if Qt is not None:
+                    item.setFlags(
+                        item.flags()
+                        | Qt.ItemIsUserCheckable
+                        | Qt.ItemIsEnabled
+                        | Qt.ItemIsSelectable
+                        | Qt.ItemIsDragEnabled
+                    )
+                item.setCheckState(
+                    Qt.Checked if (Qt is not None and enabled) else 2 if enabled else 0
+                )
+                items.append(item)
+            lst.setUpdatesEnabled(False)
+            lst.blockSignals(True)
             try:
-                pentry = plugins_cfg.get(pid, {})
-                if isinstance(pentry, dict):
-                    enabled = bool(pentry.get("enabled", True))
-                elif isinstance(pentry, bool):
-                    enabled = pentry
-            except Exception:
-                pass
+                lst.clear()
+                for item in items:
+                    lst.addItem(item)
+            finally:
+                lst.blockSignals(False)
+                lst.setUpdatesEnabled(True)
             try:
-                item.setData(0x0100, pid)
+                lst.doItemsLayout()
             except Exception:
                 pass
-            if Qt is not None:
-                item.setFlags(
-                    item.flags()
-                    | Qt.ItemIsUserCheckable
-                    | Qt.ItemIsEnabled
-                    | Qt.ItemIsSelectable
-                    | Qt.ItemIsDragEnabled
-                )
-            item.setCheckState(
-                Qt.Checked if (Qt is not None and enabled) else 2 if enabled else 0
-            )
-            lst.addItem(item)
+            btn_save.setEnabled(True)
+
         layout.addWidget(lst)
 
         # Boutons
@@ -704,6 +1241,7 @@ def open_bc_loader_dialog(self) -> None:  # UI minimale
         btn_up = QPushButton("⬆️")
         btn_down = QPushButton("⬇️")
         btn_save = QPushButton(self.tr("Enregistrer", "Save"))
+        btn_save.setEnabled(False)  # jusqu'au remplissage de la liste
         btn_cancel = QPushButton(self.tr("Annuler", "Cancel"))
 
         def _move_sel(delta: int):
@@ -752,7 +1290,7 @@ def open_bc_loader_dialog(self) -> None:  # UI minimale
                 en = it.checkState() == (Qt.Checked if Qt is not None else 2)
                 new_plugins[str(pid)] = {"enabled": bool(en), "priority": i}
                 order_ids.append(str(pid))
-            cfg_out: dict[str, Any] = dict(cfg) if isinstance(cfg, dict) else {}
+            cfg_out: dict[str, Any] = dict(cfg)
             cfg_out["plugins"] = new_plugins
             cfg_out["plugin_order"] = order_ids
 
@@ -770,17 +1308,20 @@ def open_bc_loader_dialog(self) -> None:  # UI minimale
 
             # Ecrire YML uniquement
             target = workspace_root / "bcasl.yml"
+            _CFG_CACHE.pop(str(workspace_root), None)
             try:
-                target.write_text(
-                    yaml.safe_dump(cfg_out, allow_unicode=True, sort_keys=False),
-                    encoding="utf-8",
-                )
-                if hasattr(self, "log") and self.log is not None:
-                    self.log.append(
+                written = _write_config_yml(target, cfg_out)
+                if log is not None:
+                    log(
                         self.tr(
                             "✅ Plugins enregistrés dans bcasl.yml",
                             "✅ Plugins saved to bcasl.yml",
                         )
+                        if written
+                        else self.tr(
+                            "ℹ️ bcasl.yml inchangé",
+                            "ℹ️ bcasl.yml unchanged",
+                        )
                     )
                 dlg.accept()
             except Exception as e:
@@ -809,10 +1350,42 @@ def open_bc_loader_dialog(self) -> None:  # UI minimale
                     dlg.exec()
                 except Exception:
                     pass
+
+        def _on_meta(meta_map: Any) -> None:
+            try:
+                _populate(meta_map if isinstance(meta_map, dict) else {})
+            except Exception as e:  # fenêtre fermée entre-temps, etc.
+                try:
+                    if log is not None:
+                        log(f"⚠️ Plugins Loader UI error: {e}")
+                except Exception:
+                    pass
+
+        if QThread is not None and QObject is not None and Signal is not None:
+            # Thread possédé par la fenêtre principale: il survit à la fermeture
+            # du dialogue et se libère seul (deleteLater) une fois terminé
+            thread = QThread(self) if isinstance(self, QObject) else QThread()
+            worker = _BCASLMetaWorker(api_dir)  # type: ignore[name-defined]
+            bridge = _BCASLMetaBridge(_on_meta)  # type: ignore[name-defined]
+            thread._bcasl_refs = (worker, bridge)
+            if not isinstance(self, QObject):
+                try:
+                    self._bcasl_meta_thread = thread
+                except Exception:
+                    pass
+            worker.finished.connect(bridge.on_meta)
+            worker.finished.connect(thread.quit)
+            worker.finished.connect(worker.deleteLater)
+            thread.finished.connect(thread.deleteLater)
+            worker.moveToThread(thread)
+            thread.started.connect(worker.run)
+            thread.start()
+        else:
+            _on_meta(_discover_bcasl_meta(api_dir))
     except Exception as e:
         try:
-            if hasattr(self, "log") and self.log is not None:
-                self.log.append(f"⚠️ Plugins Loader UI error: {e}")
+            if log is not None:
+                log(f"⚠️ Plugins Loader UI error: {e}")
         except Exception:
             pass
 
@@ -824,6 +1397,8 @@ def run_pre_compile_async(self, on_done: Optional[callable] = None) -> None:
     """Lance BCASL en arrière-plan si QtCore est dispo; sinon, exécution bloquante rapide.
     on_done(report) appelé à la fin si fourni.
     """
+    log = _log_sink(self)
+    _append = log or _no_log
     try:
         if not getattr(self, "workspace_dir", None):
             if callable(on_done):
@@ -833,46 +1408,19 @@ def run_pre_compile_async(self, on_done: Optional[callable] = None) -> None:
                     pass
             return
         workspace_root = Path(self.workspace_dir).resolve()
-        repo_root = Path(__file__).resolve().parents[1]
-        api_dir = repo_root / "Plugins"
+        api_dir = _API_DIR
 
         cfg = _load_workspace_config(workspace_root)
-        # Timeout: <= 0 => illimité
-        try:
-            env_timeout = float(os.environ.get("PYCOMPILER_BCASL_PLUGIN_TIMEOUT", "0"))
-        except Exception:
-            env_timeout = 0.0
-        opt = cfg.get("options", {}) if isinstance(cfg, dict) else {}
-        try:
-            cfg_timeout = (
-                float(opt.get("plugin_timeout_s", 0.0))
-                if isinstance(opt, dict)
-                else 0.0
-            )
-        except Exception:
-            cfg_timeout = 0.0
-        plugin_timeout = cfg_timeout if cfg_timeout != 0.0 else env_timeout
-        plugin_timeout = (
-            plugin_timeout if plugin_timeout and plugin_timeout > 0 else 0.0
-        )
-
-        # Respect global enabled flag: skip BCASL when disabled
-        try:
-            opt = cfg.get("options", {}) if isinstance(cfg, dict) else {}
-            bcasl_enabled = (
-                bool(opt.get("enabled", True)) if isinstance(opt, dict) else True
-            )
-        except Exception:
-            bcasl_enabled = True
+        # Timeout (<= 0 => illimité) et drapeau global: BCASL ignoré si désactivé
+        plugin_timeout, bcasl_enabled = _resolve_options(cfg)
         if not bcasl_enabled:
             try:
-                if hasattr(self, "log") and self.log is not None:
-                    self.log.append(
-                        self.tr(
-                            "⏹️ BCASL désactivé dans la configuration. Exécution ignorée\n",
-                            "⏹️ BCASL disabled in configuration. Skipping execution\n",
-                        )
+                _append(
+                    self.tr(
+                        "⏹️ BCASL désactivé dans la configuration. Exécution ignorée\n",
+                        "⏹️ BCASL disabled in configuration. Skipping execution\n",
                     )
+                )
             except Exception:
                 pass
             if callable(on_done):
@@ -895,7 +1443,7 @@ def run_pre_compile_async(self, on_done: Optional[callable] = None) -> None:
                 self._bcasl_ui_bridge = bridge
             except Exception:
                 pass
-            if hasattr(self, "log") and self.log is not None:
+            if log is not None:
                 worker.log.connect(bridge.on_log)
             worker.finished.connect(bridge.on_finished)
             worker.finished.connect(worker.deleteLater)
@@ -908,70 +1456,32 @@ def run_pre_compile_async(self, on_done: Optional[callable] = None) -> None:
 
         # Repli: exécution synchrone
         try:
-            manager = BCASL(workspace_root, config=cfg, plugin_timeout_s=plugin_timeout)
-            loaded, errors = manager.load_plugins_from_directory(api_dir)
-            if hasattr(self, "log") and self.log is not None:
-                self.log.append(
-                    f"🧩 BCASL: {loaded} package(s) chargé(s) depuis Plugins/\n"
+            with BCASL(
+                workspace_root, config=cfg, plugin_timeout_s=plugin_timeout
+            ) as manager:
+                loaded, errors = manager.load_plugins_from_directory(
+                    api_dir, skip=_disabled_packages(api_dir, cfg)
                 )
-                for mod, msg in errors or []:
-                    self.log.append(f"⚠️ Plugin '{mod}': {msg}\n")
-            # Appliquer config
-            pmap = cfg.get("plugins", {}) if isinstance(cfg, dict) else {}
-            if isinstance(pmap, dict):
-                for pid, val in pmap.items():
-                    try:
-                        enabled = (
-                            val
-                            if isinstance(val, bool)
-                            else bool((val or {}).get("enabled", True))
-                        )
-                        if not enabled:
-                            manager.disable_plugin(pid)
-                    except Exception:
-                        pass
-                    try:
-                        if isinstance(val, dict) and "priority" in val:
-                            manager.set_priority(pid, int(val.get("priority", 0)))
-                    except Exception:
-                        pass
-            order_list = (
-                list(cfg.get("plugin_order", [])) if isinstance(cfg, dict) else []
-            )
-            if not order_list:
-                try:
-                    meta_en = _discover_bcasl_meta(api_dir)
-                    order_list = list(compute_tag_order(meta_en))
-                except Exception:
-                    order_list = []
-            if order_list:
-                for idx, pid in enumerate(order_list):
-                    try:
-                        if hasattr(self, "log") and self.log is not None:
-                            self.log.append(f"⏫ Priorité {idx} pour {pid}\n")
-                        manager.set_priority(pid, int(idx))
-                    except Exception:
-                        pass
-            # Préparer les métadonnées du workspace
-            workspace_meta = {
-                "workspace_name": workspace_root.name,
-                "workspace_path": str(workspace_root),
-                "file_patterns": cfg.get("file_patterns", []),
-                "exclude_patterns": cfg.get("exclude_patterns", []),
-                "required_files": cfg.get("required_files", []),
-            }
-            report = manager.run_pre_compile(
-                PreCompileContext(
-                    workspace_root, 
-                    config=cfg,
-                    workspace_metadata=workspace_meta
+                _append(_load_summary(loaded, errors))
+                # Appliquer config
+                _apply_plugin_config(manager, cfg, api_dir, log)
+                # Préparer les métadonnées du workspace
+                workspace_meta = {
+                    "workspace_name": workspace_root.name,
+                    "workspace_path": str(workspace_root),
+                    "file_patterns": cfg.get("file_patterns", []),
+                    "exclude_patterns": cfg.get("exclude_patterns", []),
+                    "required_files": cfg.get("required_files", []),
+                }
+                report = manager.run_pre_compile(
+                    PreCompileContext(
+                        workspace_root, config=cfg, workspace_metadata=workspace_meta
+                    )
                 )
-            )
         except Exception as _e:
             report = None
             try:
-                if hasattr(self, "log") and self.log is not None:
-                    self.log.append(f"⚠️ Erreur BCASL: {_e}\n")
+                _append(f"⚠️ Erreur BCASL: {_e}\n")
             except Exception:
                 pass
         if callable(on_done):
@@ -986,139 +1496,61 @@ def run_pre_compile_async(self, on_done: Optional[callable] = None) -> None:
         except Exception:
             pass
         try:
-            if hasattr(self, "log") and self.log is not None:
-                self.log.append(f"⚠️ Erreur BCASL (async): {e}\n")
+            _append(f"⚠️ Erreur BCASL (async): {e}\n")
         except Exception:
             pass
 
 
 def run_pre_compile(self) -> Optional[object]:
     """Exécute la phase BCASL de pré-compilation (chemin synchrone, simple)."""
+    log = _log_sink(self)
+    _append = log or _no_log
     try:
         if not getattr(self, "workspace_dir", None):
             return None
         workspace_root = Path(self.workspace_dir).resolve()
-        repo_root = Path(__file__).resolve().parents[1]
-        api_dir = repo_root / "Plugins"
+        api_dir = _API_DIR
 
         cfg = _load_workspace_config(workspace_root)
-        try:
-            env_timeout = float(os.environ.get("PYCOMPILER_BCASL_PLUGIN_TIMEOUT", "0"))
-        except Exception:
-            env_timeout = 0.0
-        try:
-            opt = cfg.get("options", {}) if isinstance(cfg, dict) else {}
-            cfg_timeout = (
-                float(opt.get("plugin_timeout_s", 0.0))
-                if isinstance(opt, dict)
-                else 0.0
-            )
-        except Exception:
-            cfg_timeout = 0.0
-        plugin_timeout = cfg_timeout if cfg_timeout != 0.0 else env_timeout
-        plugin_timeout = (
-            plugin_timeout if plugin_timeout and plugin_timeout > 0 else 0.0
-        )
-
-        # Respect global enabled flag: skip BCASL when disabled
-        try:
-            opt = cfg.get("options", {}) if isinstance(cfg, dict) else {}
-            bcasl_enabled = (
-                bool(opt.get("enabled", True)) if isinstance(opt, dict) else True
-            )
-        except Exception:
-            bcasl_enabled = True
+        # Timeout (<= 0 => illimité) et drapeau global: BCASL ignoré si désactivé
+        plugin_timeout, bcasl_enabled = _resolve_options(cfg)
         if not bcasl_enabled:
             try:
-                if hasattr(self, "log") and self.log is not None:
-                    self.log.append(
-                        "⏹️ BCASL désactivé dans la configuration. Exécution ignorée\n"
-                    )
+                _append("⏹️ BCASL désactivé dans la configuration. Exécution ignorée\n")
             except Exception:
                 pass
             return None
 
-        manager = BCASL(workspace_root, config=cfg, plugin_timeout_s=plugin_timeout)
-        loaded, errors = manager.load_plugins_from_directory(api_dir)
-        if hasattr(self, "log") and self.log is not None:
-            self.log.append(
-                f"🧩 BCASL: {loaded} package(s) chargé(s) depuis Plugins/\n"
+        with BCASL(
+            workspace_root, config=cfg, plugin_timeout_s=plugin_timeout
+        ) as manager:
+            loaded, errors = manager.load_plugins_from_directory(
+                api_dir, skip=_disabled_packages(api_dir, cfg)
             )
-            for mod, msg in errors or []:
-                self.log.append(f"⚠️ Plugin '{mod}': {msg}\n")
+            _append(_load_summary(loaded, errors))
 
-        # Appliquer activation/priorité
-        try:
-            pmap = cfg.get("plugins", {}) if isinstance(cfg, dict) else {}
-            if isinstance(pmap, dict):
-                for pid, val in pmap.items():
-                    try:
-                        enabled = (
-                            val
-                            if isinstance(val, bool)
-                            else bool((val or {}).get("enabled", True))
-                        )
-                        if not enabled:
-                            manager.disable_plugin(pid)
-                    except Exception:
-                        pass
-                    try:
-                        if isinstance(val, dict) and "priority" in val:
-                            manager.set_priority(pid, int(val.get("priority", 0)))
-                    except Exception:
-                        pass
-            order_list = []
-            try:
-                order_list = (
-                    list(cfg.get("plugin_order", [])) if isinstance(cfg, dict) else []
-                )
-            except Exception:
-                order_list = []
-            if not order_list:
-                try:
-                    meta_en = _discover_bcasl_meta(api_dir)
-                    order_list = list(compute_tag_order(meta_en))
-                except Exception:
-                    order_list = []
-            if order_list:
-                for idx, pid in enumerate(order_list):
-                    try:
-                        if hasattr(self, "log") and self.log is not None:
-                            self.log.append(f"⏫ Priorité {idx} pour {pid}\n")
-                        manager.set_priority(pid, int(idx))
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+            # Appliquer activation/priorité
+            _apply_plugin_config(manager, cfg, api_dir, log)
 
-        # Préparer les métadonnées du workspace
-        workspace_meta = {
-            "workspace_name": workspace_root.name,
-            "workspace_path": str(workspace_root),
-            "file_patterns": cfg.get("file_patterns", []),
-            "exclude_patterns": cfg.get("exclude_patterns", []),
-            "required_files": cfg.get("required_files", []),
-        }
-        report = manager.run_pre_compile(
-            PreCompileContext(
-                workspace_root, 
-                config=cfg,
-                workspace_metadata=workspace_meta
-            )
-        )
-        if hasattr(self, "log") and self.log is not None:
-            self.log.append("BCASL - Rapport:\n")
-            for item in report:
-                state = "OK" if item.success else f"FAIL: {item.error}"
-                self.log.append(
-                    f" - {item.plugin_id}: {state} ({item.duration_ms:.1f} ms)\n"
+            # Préparer les métadonnées du workspace
+            workspace_meta = {
+                "workspace_name": workspace_root.name,
+                "workspace_path": str(workspace_root),
+                "file_patterns": cfg.get("file_patterns", []),
+                "exclude_patterns": cfg.get("exclude_patterns", []),
+                "required_files": cfg.get("required_files", []),
+            }
+            report = manager.run_pre_compile(
+                PreCompileContext(
+                    workspace_root, config=cfg, workspace_metadata=workspace_meta
                 )
-            self.log.append(report.summary() + "\n")
+            )
+        if log is not None:
+            log(_report_text(report))
         return report
     except Exception as e:
         try:
-            if hasattr(self, "log") and self.log is not None:
-                self.log.append(f"⚠️ Erreur BCASL: {e}\n")
+            _append(f"⚠️ Erreur BCASL: {e}\n")
         except Exception:
             pass
         return None
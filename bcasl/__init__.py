@@ -14,19 +14,7 @@
 # limitations under the License.
 
 
-"""
-BCASL - Before-Compilation Actions System Loader
-
-Point d'entrée du package: expose l'API publique minimale et stable.
-
-    from bcasl import (
-        BCASL, PluginBase, PluginMeta, PreCompileContext, ExecutionReport,
-        register_plugin, BCASL_PLUGIN_REGISTER_FUNC,
-        run_pre_compile_async, run_pre_compile,
-        ensure_bcasl_thread_stopped, open_bc_loader_dialog,
-        resolve_bcasl_timeout,
-    )
-"""
+"""BCASL - Before-Compilation Actions System Loader (voir docs/BCASL_API.md)."""
 from __future__ import annotations
 
 from .executor import BCASL
@@ -22,21 +22,46 @@ from .Base import (
     PluginMeta,
     PreCompileContext,
     _logger,
+    _options_of,
+    invalidate_fs_cache,
 )
 
+import copy
+import functools
+import graphlib
 import heapq
+import importlib.abc
+import importlib.machinery
 import importlib.util
+import marshal
 import multiprocessing as mp
+import multiprocessing.connection
+import multiprocessing.util
 import os
+import pickle
+import py_compile
 import sys
+import threading
 import time
+import traceback
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
 from pathlib import Path
-from typing import Any, Optional
+from types import ModuleType
+from typing import Any, Callable, Collection, Iterable, Optional
 
 
 class BCASL:
     """Gestionnaire principal des plugins et de leur exécution avant compilation."""
 
+    # Modules de plugins déjà exécutés, par chemin de __init__.py:
+    # (empreinte du package, module, copies vierges des plugins enregistrés).
+    # Partagé entre instances; chaque gestionnaire reçoit ses propres copies.
+    _module_cache: dict[
+        str, tuple[tuple[int, int], ModuleType, dict[str, BcPluginBase]]
+    ] = {}
+
     def __init__(
         self,
         project_root: Path,
@@ -53,6 +78,24 @@ class BCASL:
         self.sandbox = bool(sandbox)
         # Timeout settings
         self.plugin_timeout_s = float(plugin_timeout_s)
+        # Graphe des dépendances et ordres résolus (voir _dep_graph)
+        self._graph_cache: Optional[tuple[tuple, tuple]] = None
+        self._order_cache: dict[str, list[str]] = {}
+        self._dag_cache: Optional[_DagIndex] = None
+        # Plugins de confiance ayant dépassé leur timeout: de nouveau sandboxés
+        self._timed_out_trusted: set[str] = set()
+        # Pool de workers sandbox, créé à la première exécution (voir close())
+        self._pool: Optional[_SandboxPool] = None
+
+    @property
+    def config(self) -> dict[str, Any]:
+        return self._config
+
+    @config.setter
+    def config(self, value: Optional[dict[str, Any]]) -> None:
+        # Vue "options" tenue à jour à chaque réaffectation de la config
+        self._config = dict(value or {})
+        self._options = _options_of(self._config)
 
     # API publique
     def add_plugin(self, plugin: BcPluginBase) -> None:
@@ -93,6 +136,17 @@ class BCASL:
         rec.active = False
         return True
 
+    def disable_many(self, plugin_ids: Iterable[str]) -> int:
+        """Désactive plusieurs plugins d'un coup; retourne le nombre trouvé."""
+        registry = self._registry
+        found = 0
+        for pid in plugin_ids:
+            rec = registry.get(pid)
+            if rec is not None:
+                rec.active = False
+                found += 1
+        return found
+
     def set_priority(self, plugin_id: str, priority: int) -> bool:
         rec = self._registry.get(plugin_id)
         if not rec:
@@ -101,12 +155,75 @@ class BCASL:
         rec.plugin.priority = int(priority)
         return True
 
+    def set_priorities(self, priorities: dict[str, int]) -> int:
+        """Applique plusieurs priorités d'un coup; retourne le nombre appliqué.
+
+        Les ids inconnus sont ignorés. L'ordre d'exécution est recalculé une
+        seule fois, au prochain run (graphe indexé sur les priorités).
+        """
+        registry = self._registry
+        applied = 0
+        for pid, priority in priorities.items():
+            rec = registry.get(pid)
+            if rec is None:
+                continue
+            rec.priority = int(priority)
+            rec.plugin.priority = int(priority)
+            applied += 1
+        return applied
+
+    def _get_pool(self, size: int, config: dict[str, Any]) -> "_SandboxPool":
+        """Pool sandbox persistant, recréé seulement si les options changent."""
+        opts = _options_of(config)
+        pool = self._pool
+        if pool is not None:
+            if pool.size >= size and _options_of(pool.config) == opts:
+                pool.set_config(config)
+                return pool
+            pool.close()
+        # RLIMIT_CPU est cumulatif par processus: un worker par plugin dans ce cas
+        try:
+            limits = opts.get("plugin_limits", {}) or {}
+            max_runs = 1 if int(limits.get("cpu_time_s", 0)) > 0 else 0
+        except Exception:
+            max_runs = 0
+        self._pool = _SandboxPool(
+            size,
+            dict(config),
+            max_runs=max_runs,
+            pin_cpus=bool(opts.get("pin_sandbox_workers", False)),
+        )
+        return self._pool
+
+    def close(self) -> None:
+        """Arrête les workers sandbox persistants (réutilisés entre exécutions)."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+
+    def __enter__(self) -> "BCASL":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def invalidate_module_cache() -> None:
+        """Force la ré-exécution des modules de plugins au prochain chargement."""
+        BCASL._module_cache.clear()
+
+    @staticmethod
+    def invalidate_fs_cache() -> None:
+        """Vide le cache partagé de PreCompileContext.iter_files (mode watch)."""
+        invalidate_fs_cache()
+
     # Chargement automatique
     def load_plugins_from_directory(
-        self, directory: Path
+        self, directory: Path, skip: Optional[Collection[str]] = None
     ) -> tuple[int, list[tuple[str, str]]]:
         """Charge automatiquement tous les plugins depuis un dossier.
 
+        skip: noms de packages à ignorer sans les importer (plugins désactivés).
         Retourne (nombre_plugins_enregistrés, liste_erreurs[(module, message)]).
         """
         directory = Path(directory)
@@ -123,22 +240,37 @@ class BCASL:
             )
         except Exception:
             pkg_dirs = []
+        candidates: list[tuple[Path, Path, str]] = []
         for pkg_dir in pkg_dirs:
             if pkg_dir.name.startswith("__"):
                 continue
+            if skip and pkg_dir.name in skip:
+                _logger.debug("Package %s désactivé, non importé", pkg_dir.name)
+                continue
             init_file = pkg_dir / "__init__.py"
             if not init_file.exists():
                 continue
-            mod_name = f"bcasl_api_{pkg_dir.name}"
+            candidates.append((pkg_dir, init_file, f"bcasl_api_{pkg_dir.name}"))
+
+        # Phase 1: imports en parallèle (lecture disque et compilation se recouvrent)
+        def _import(item: tuple[Path, Path, str]) -> Any:
             try:
-                spec = importlib.util.spec_from_file_location(
-                    mod_name, str(init_file), submodule_search_locations=[str(pkg_dir)]
-                )
-                if spec is None or spec.loader is None:
-                    raise ImportError("spec invalide")
-                module = importlib.util.module_from_spec(spec)
-                sys.modules[mod_name] = module
-                spec.loader.exec_module(module)  # type: ignore[attr-defined]
+                return _import_plugin_module(*item)
+            except Exception as exc:  # isolation
+                return exc
+
+        if len(candidates) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(candidates))) as tpe:
+                imported = list(tpe.map(_import, candidates))
+        else:
+            imported = [_import(item) for item in candidates]
+
+        # Phase 2: enregistrement séquentiel dans l'ordre trié (insert_idx stable)
+        for (pkg_dir, init_file, mod_name), result in zip(candidates, imported):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                module, stamp, cached = result
 
                 # Recherche et appel de la fonction d'enregistrement si présente
                 reg = getattr(module, BCASL_PLUGIN_REGISTER_FUNC, None)
@@ -153,11 +285,39 @@ class BCASL:
                 before_ids = set(self._registry.keys())
                 reg(self)  # le package appelle self.add_plugin(...)
                 new_ids = [k for k in self._registry.keys() if k not in before_ids]
+                templates = cached[2] if cached is not None else None
                 for pid in new_ids:
                     rec = self._registry.get(pid)
-                    if rec is not None:
-                        rec.module_path = init_file
-                        rec.module_name = mod_name
+                    if rec is None:
+                        continue
+                    # Attribut cherché sur l'instance du module, avant substitution
+                    attr_name = _plugin_attr_name(module, rec.plugin)
+                    tpl = templates.get(pid) if templates is not None else None
+                    if tpl is not None:
+                        # Module repris du cache: instance neuve, sans l'état ni
+                        # les priorités laissés par un gestionnaire précédent
+                        rec = _PluginRecord(copy.deepcopy(tpl), rec.insert_idx)
+                        self._registry[pid] = rec
+                    rec.module_path = init_file
+                    rec.module_path_str = str(init_file)
+                    rec.module_name = mod_name
+                    rec.plugin_attr_name = attr_name
+                if cached is None:
+                    # Copies vierges prises avant toute exécution; un plugin non
+                    # copiable laisse le module hors cache (ré-exécuté au besoin)
+                    try:
+                        BCASL._module_cache[str(init_file)] = (
+                            stamp,
+                            module,
+                            {
+                                pid: copy.deepcopy(self._registry[pid].plugin)
+                                for pid in new_ids
+                            },
+                        )
+                    except Exception as exc:
+                        _logger.debug(
+                            "Package %s non mis en cache: %s", pkg_dir.name, exc
+                        )
                 # Validation de signature supprimée (simplification)
                 added = len(new_ids)
                 if added <= 0:
@@ -174,6 +334,45 @@ class BCASL:
         return count, errors
 
     # Ordonnancement et exécution
+    def _dep_graph(
+        self,
+    ) -> tuple[dict[str, _PluginRecord], dict[str, int], dict[str, list[str]]]:
+        """(actifs, indeg, children) mémoïsés tant que le registre ne change pas.
+
+        La clé couvre id, état actif, dépendances, priorité, ordre d'insertion et
+        module source (colonne de _DagIndex): toute mutation (API publique ou
+        directe sur les records) invalide le cache.
+        Les appelants ne doivent pas muter les structures renvoyées.
+        """
+        key = tuple(
+            (
+                pid,
+                rec.active,
+                rec.requires,
+                rec.priority,
+                rec.insert_idx,
+                rec.module_path_str,
+            )
+            for pid, rec in self._registry.items()
+        )
+        cached = self._graph_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        active_items = {pid: rec for pid, rec in self._registry.items() if rec.active}
+        indeg, children = _build_dep_graph(active_items)
+        self._graph_cache = (key, (active_items, indeg, children))
+        self._order_cache.clear()
+        return self._graph_cache[1]
+
+    def _dag_index(self) -> "_DagIndex":
+        """Vue compacte (ids entiers, tableaux) du graphe courant, mémoïsée avec lui."""
+        graph = self._dep_graph()
+        dag = self._dag_cache
+        if dag is None or dag.graph is not graph:
+            dag = _DagIndex(graph)
+            self._dag_cache = dag
+        return dag
+
     def _resolve_order_with_tags(self) -> list[str]:
         """Résout l'ordre d'exécution en respectant dépendances, priorités et tags.
 
@@ -192,7 +391,7 @@ class BCASL:
             describe_plugin_priority,
         )
 
-        active_items = {pid: rec for pid, rec in self._registry.items() if rec.active}
+        active_items, _indeg, children = self._dep_graph()
         if not active_items:
             return []
 
@@ -226,61 +425,16 @@ class BCASL:
             except Exception:
                 return DEFAULT_TAG_PRIORITY
 
-        # Construire graphe des dépendances
-        indeg: dict[str, int] = {pid: 0 for pid in active_items}
-        children: dict[str, list[str]] = {pid: [] for pid in active_items}
-
-        for pid, rec in active_items.items():
-            for dep in rec.requires:
-                if dep not in active_items:
-                    _logger.warning(
-                        "Dépendance manquante pour %s: '%s' (ignorée)", pid, dep
-                    )
-                    continue
-                indeg[pid] += 1
-                children[dep].append(pid)
-
-        # File de départ triée par (tag_priority, priority, insert_idx, id)
-        roots = sorted(
-            [pid for pid, d in indeg.items() if d == 0],
-            key=lambda x: (
+        # Tri topologique, à égalité: (tag_priority, priority, insert_idx)
+        order = _topological_order(
+            active_items,
+            children,
+            lambda x: (
                 _compute_tag_priority(x),
                 active_items[x].priority,
                 active_items[x].insert_idx,
-                x,
             ),
         )
-        order: list[str] = []
-
-        heap: list[tuple[int, int, int, str]] = []
-        for pid in roots:
-            rec = active_items[pid]
-            tag_prio = _compute_tag_priority(pid)
-            heapq.heappush(heap, (tag_prio, rec.priority, rec.insert_idx, pid))
-
-        while heap:
-            _, _, _, pid = heapq.heappop(heap)
-            order.append(pid)
-            for ch in children[pid]:
-                indeg[ch] -= 1
-                if indeg[ch] == 0:
-                    rch = active_items[ch]
-                    tag_prio = _compute_tag_priority(ch)
-                    heapq.heappush(heap, (tag_prio, rch.priority, rch.insert_idx, ch))
-
-        if len(order) != len(active_items):
-            # Cycle détecté; insérer les restants par priorité
-            remaining = [pid for pid in active_items if pid not in order]
-            _logger.error("Cycle de dépendances détecté: %s", ", ".join(remaining))
-            remaining.sort(
-                key=lambda x: (
-                    _compute_tag_priority(x),
-                    active_items[x].priority,
-                    active_items[x].insert_idx,
-                    x,
-                )
-            )
-            order.extend(remaining)
 
         # Logging lisible des phases d'exécution
         try:
@@ -302,57 +456,21 @@ class BCASL:
 
         - Filtre les plugins inactifs
         - Ignore les dépendances inconnues (log warning)
-        - Kahn + file de priorité (priority, insert_idx) pour stabilité
+        - graphlib + file de priorité (priority, insert_idx) pour stabilité
         - En cas de cycle, journalise et insère les restants par priorité
         """
-        active_items = {pid: rec for pid, rec in self._registry.items() if rec.active}
+        active_items, _indeg, children = self._dep_graph()
         if not active_items:
             return []
-
-        # Construire graphe
-        indeg: dict[str, int] = {pid: 0 for pid in active_items}
-        children: dict[str, list[str]] = {pid: [] for pid in active_items}
-
-        for pid, rec in active_items.items():
-            for dep in rec.requires:
-                if dep not in active_items:
-                    _logger.warning(
-                        "Dépendance manquante pour %s: '%s' (ignorée)", pid, dep
-                    )
-                    continue
-                indeg[pid] += 1
-                children[dep].append(pid)
-
-        # File de départ (indeg=0) triée par priorité puis ordre d'insertion
-        roots = sorted(
-            [pid for pid, d in indeg.items() if d == 0],
-            key=lambda x: (active_items[x].priority, active_items[x].insert_idx, x),
-        )
-        order: list[str] = []
-
-        heap: list[tuple[int, int, str]] = []
-        for pid in roots:
-            rec = active_items[pid]
-            heapq.heappush(heap, (rec.priority, rec.insert_idx, pid))
-
-        while heap:
-            _, _, pid = heapq.heappop(heap)
-            order.append(pid)
-            for ch in children[pid]:
-                indeg[ch] -= 1
-                if indeg[ch] == 0:
-                    rch = active_items[ch]
-                    heapq.heappush(heap, (rch.priority, rch.insert_idx, ch))
-
-        if len(order) != len(active_items):
-            # Cycle détecté; insérer les restants par priorité pour ne pas bloquer
-            remaining = [pid for pid in active_items if pid not in order]
-            _logger.error("Cycle de dépendances détecté: %s", ", ".join(remaining))
-            remaining.sort(
-                key=lambda x: (active_items[x].priority, active_items[x].insert_idx, x)
+        cached = self._order_cache.get("priority")
+        if cached is None:
+            cached = _topological_order(
+                active_items,
+                children,
+                lambda x: (active_items[x].priority, active_items[x].insert_idx),
             )
-            order.extend(remaining)
-        return order
+            self._order_cache["priority"] = cached
+        return list(cached)
 
     def run_pre_compile(
         self, ctx: Optional[PreCompileContext] = None
@@ -372,14 +490,7 @@ class BCASL:
 
         report = ExecutionReport()
         # Options d'exécution
-        try:
-            opts = (
-                dict(self.config or {}).get("options", {})
-                if isinstance(self.config, dict)
-                else {}
-            )
-        except Exception:
-            opts = {}
+        opts = self._options
         eff_sandbox = bool(opts.get("sandbox", self.sandbox))
         # Déterminer le parallélisme cible
         try:
@@ -398,280 +509,939 @@ class BCASL:
         if parallelism < 1:
             parallelism = 1
 
-        # Construire graphe des dépendances des plugins actifs
-        active_items = {pid: rec for pid, rec in self._registry.items() if rec.active}
+        # Graphe des dépendances des plugins actifs (mémoïsé, copié avant mutation)
+        active_items, _indeg, _children = self._dep_graph()
         if not active_items:
             _logger.info("Aucun plugin Bcasl actif")
             return report
-        indeg: dict[str, int] = {pid: 0 for pid in active_items}
-        children: dict[str, list[str]] = {pid: [] for pid in active_items}
-        for pid, rec in active_items.items():
-            for dep in rec.requires:
-                if dep not in active_items:
-                    _logger.warning(
-                        "Dépendance manquante pour %s: '%s' (ignorée)", pid, dep
-                    )
-                    continue
-                indeg[pid] += 1
-                children[dep].append(pid)
-
-        # File d'attente initiale (indeg=0) triée par (priority, insert_idx, pid)
-
-        ready: list[tuple[int, int, str]] = []
-        for pid, rec in active_items.items():
-            if indeg[pid] == 0:
-                heapq.heappush(ready, (rec.priority, rec.insert_idx, pid))
-
-        # Fallback: si pas de sandbox ou parallélisme=1, revient au mode séquentiel
-        if not eff_sandbox or parallelism <= 1:
-            order: list[str] = []
-            tmp_ready = list(ready)
-            heapq.heapify(tmp_ready)
-            while tmp_ready:
-                _, _, pid = heapq.heappop(tmp_ready)
-                order.append(pid)
-                for ch in children[pid]:
-                    indeg[ch] -= 1
-                    if indeg[ch] == 0:
-                        rch = active_items[ch]
-                        heapq.heappush(tmp_ready, (rch.priority, rch.insert_idx, ch))
-            # Séquentiel sandbox/non-sandbox
-            for pid in order:
-                rec = active_items[pid]
-                plg = rec.plugin
-                start = time.perf_counter()
-                if eff_sandbox and getattr(rec, "module_path", None):
-                    _ctx = mp.get_context("spawn")
-                    q = _ctx.Queue()
-                    p = _ctx.Process(
-                        target=_plugin_worker,
-                        args=(
-                            str(rec.module_path),
-                            pid,
-                            str(self.project_root),
-                            ctx.config,
-                            q,
-                        ),
-                    )
-                    p.start()
-                    timeout = self.plugin_timeout_s
-                    if timeout and timeout > 0:
-                        p.join(timeout)
-                    else:
-                        p.join()
-                    if p.is_alive():
-                        try:
-                            p.terminate()
-                        except Exception:
-                            pass
-                        try:
-                            p.join(1.0)
-                        except Exception:
-                            pass
-                        duration_ms = (time.perf_counter() - start) * 1000.0
-                        report.add(
-                            ExecutionItem(
-                                plugin_id=pid,
-                                name=plg.meta.name,
-                                success=False,
-                                duration_ms=duration_ms,
-                                error=f"timeout après {self.plugin_timeout_s:.1f}s",
-                            )
-                        )
-                        _logger.error(
-                            "Plugin %s timeout après %.1fs", pid, self.plugin_timeout_s
-                        )
-                    else:
-                        try:
-                            res = q.get_nowait()
-                        except Exception:
-                            res = {
-                                "ok": False,
-                                "error": "aucun résultat renvoyé (crash du processus enfant ?)",
-                                "duration_ms": (time.perf_counter() - start) * 1000.0,
-                            }
-                        duration_ms = float(
-                            res.get(
-                                "duration_ms", (time.perf_counter() - start) * 1000.0
-                            )
-                        )
-                        if res.get("ok"):
-                            report.add(
-                                ExecutionItem(
-                                    plugin_id=pid,
-                                    name=plg.meta.name,
-                                    success=True,
-                                    duration_ms=duration_ms,
-                                )
-                            )
-                        else:
-                            report.add(
-                                ExecutionItem(
-                                    plugin_id=pid,
-                                    name=plg.meta.name,
-                                    success=False,
-                                    duration_ms=duration_ms,
-                                    error=str(res.get("error", "")),
-                                )
-                            )
-                else:
-                    try:
-                        plg.on_pre_compile(ctx)
-                        duration_ms = (time.perf_counter() - start) * 1000.0
-                        report.add(
-                            ExecutionItem(
-                                plugin_id=pid,
-                                name=plg.meta.name,
-                                success=True,
-                                duration_ms=duration_ms,
-                            )
-                        )
-                    except Exception as exc:
-                        duration_ms = (time.perf_counter() - start) * 1000.0
-                        report.add(
-                            ExecutionItem(
-                                plugin_id=pid,
-                                name=plg.meta.name,
-                                success=False,
-                                duration_ms=duration_ms,
-                                error=str(exc),
-                            )
-                        )
+
+        # Sans sandbox: exécution séquentielle dans l'ordre résolu (mémoïsé)
+        if not eff_sandbox:
+            for pid in self._resolve_order():
+                report.add(_run_in_process(pid, active_items[pid].plugin, ctx))
             _logger.info(report.summary())
             return report
 
-        # Exécution parallèle (sandbox True)
-        _ctx = mp.get_context("spawn")
-        running: dict[str, tuple[mp.Process, mp.Queue, float]] = {}
-        # Scheduler principal
-        while ready or running:
-            # Lancer tant que possible
-            while ready and len(running) < parallelism:
-                _, _, pid = heapq.heappop(ready)
-                rec = active_items[pid]
-                q = _ctx.Queue()
-                p = _ctx.Process(
-                    target=_plugin_worker,
-                    args=(
-                        str(rec.module_path),
-                        pid,
-                        str(self.project_root),
-                        ctx.config,
-                        q,
-                    ),
-                )
-                p.start()
-                running[pid] = (p, q, time.perf_counter())
-            # Collecte non bloquante et gestion timeouts
-            to_remove: list[str] = []
-            for pid, (proc, q, start_t) in list(running.items()):
-                timeout = self.plugin_timeout_s
-                alive = proc.is_alive()
-                timed_out = False
-                if timeout and timeout > 0 and alive:
-                    if (time.perf_counter() - start_t) >= timeout:
-                        timed_out = True
-                        try:
-                            proc.terminate()
-                        except Exception:
-                            pass
-                        try:
-                            proc.join(1.0)
-                        except Exception:
-                            pass
-                if not alive or timed_out:
-                    rec = active_items[pid]
-                    plg = rec.plugin
-                    if not timed_out:
-                        try:
-                            res = q.get_nowait()
-                        except Exception:
-                            res = {
-                                "ok": False,
-                                "error": "aucun résultat renvoyé (crash du processus enfant ?)",
-                                "duration_ms": (time.perf_counter() - start_t) * 1000.0,
-                            }
-                        duration_ms = float(
-                            res.get(
-                                "duration_ms", (time.perf_counter() - start_t) * 1000.0
-                            )
-                        )
-                        if res.get("ok"):
-                            report.add(
-                                ExecutionItem(
-                                    plugin_id=pid,
-                                    name=plg.meta.name,
-                                    success=True,
-                                    duration_ms=duration_ms,
-                                )
-                            )
+        # Graphe compact (ids entiers, enfants en CSR) mémoïsé avec le graphe
+        dag = self._dag_index()
+        pids = dag.pids
+        plugins = dag.plugins
+        names = dag.names
+        module_paths = dag.module_paths
+        attr_names = dag.attr_names
+        heap_keys = dag.heap_keys
+        child_ptr = dag.child_ptr
+        child_idx = dag.child_idx
+        indeg = array("i", dag.indeg)
+        # File d'attente initiale (indeg=0) triée par (priority, insert_idx, id);
+        # clés de tas précalculées avec le DAG, jamais reconstruites en boucle
+        ready: list[tuple[int, int, int]] = [
+            heap_keys[i] for i in range(len(pids)) if indeg[i] == 0
+        ]
+        heapify = heapq.heapify
+        heapify(ready)
+
+        # Sandbox: jusqu'à `parallelism` plugins en vol sur le pool persistant;
+        # chaque plugin prêt est soumis dès qu'un worker se libère
+        pool = self._get_pool(parallelism, ctx.config)
+        timeout = self.plugin_timeout_s
+        # Plugins de confiance (config ou inproc=True): exécutés dans un thread
+        # du processus courant (voir _ThreadRun), sans spawn ni aller-retour IPC,
+        # suivis par la même boucle d'attente et le même tas d'échéances
+        try:
+            trusted = {str(p) for p in (opts.get("trusted_plugins") or ())}
+        except Exception:
+            trusted = set()
+        trusted.update(
+            pid for pid, plg in zip(pids, plugins) if getattr(plg, "inproc", False)
+        )
+        trusted -= self._timed_out_trusted
+        # Démarrer d'emblée les workers utiles (largeur du plus grand niveau du
+        # DAG): leurs interpréteurs démarrent en parallèle au lieu d'au fil des
+        # plugins débloqués; le pool grandit encore à la demande si besoin
+        sandboxed = {
+            i
+            for i, pid in enumerate(pids)
+            if module_paths[i] is not None and pid not in trusted
+        }
+        # Bytecode prêt pour les workers (voir _PrecompiledSourceLoader): compilé
+        # ici seulement, jamais pour un chargement sans pool sandbox
+        for i in sandboxed:
+            _precompile_plugin(module_paths[i])
+        pool.prestart(min(parallelism, _widest_level(dag, sandboxed)))
+        # Plugins en vol (worker sandbox ou thread), en colonnes par id (None/0.0
+        # hors exécution): pas de dict à parcourir ni de seconde passe de retrait
+        workers: list[Any] = [None] * len(pids)
+        started = array("q", bytes(8 * len(pids)))  # perf_counter_ns au lancement
+        n_running = 0
+        # Pipe de résultats -> plugin, tenu à jour au lancement/à la fin
+        waiters: dict[Any, int] = {}
+        # Tas des échéances (deadline, id); entrées périmées ignorées au dépilage
+        # Horodatages en ns entiers (perf_counter_ns): comparaisons sans flottants
+        deadlines: list[tuple[int, int]] = []
+        use_timeout = bool(timeout and timeout > 0)
+        timeout_ns = int(timeout * 1e9) if use_timeout else 0
+        # Invariants de boucle liés localement (chemin chaud du planificateur)
+        pc = time.perf_counter_ns
+        flush = report.extend
+        push = heapq.heappush
+        pop = heapq.heappop
+        wait = mp.connection.wait
+        root_s = str(self.project_root)
+        done_items: list[ExecutionItem] = []
+        timed_out: list[str] = []
+        # Threads en timeout du réveil courant, et dépendants déjà écartés
+        stuck: list[int] = []
+        blocked = bytearray(len(pids))
+        while ready or n_running:
+            done: list[int] = []
+            while ready and n_running < parallelism:
+                _, _, i = pop(ready)
+                pid = pids[i]
+                module_path = module_paths[i]
+                if module_path is None or pid in trusted:
+                    # Plugin de confiance, ou ajouté par programme (aucun module à
+                    # recharger en sandbox): thread du processus courant
+                    worker = _ThreadRun(pid, plugins[i], ctx)
+                else:
+                    worker = pool.submit(module_path, pid, root_s, attr_names[i])
+                start = pc()
+                workers[i] = worker
+                started[i] = start
+                n_running += 1
+                waiters[worker.results] = i
+                if use_timeout:
+                    push(deadlines, (start + timeout_ns, i))
+            if n_running:
+                # Attente bloquante du premier résultat (ou EOF d'un worker mort),
+                # bornée par l'échéance de timeout la plus proche
+                while deadlines and workers[deadlines[0][1]] is None:
+                    pop(deadlines)
+                wait_s = max(0, deadlines[0][0] - pc()) / 1e9 if deadlines else None
+                # Fin de plugin = message sur le pipe du worker persistant (pas une
+                # sortie de processus): un waitid(P_ALL) sur SIGCHLD ne la verrait
+                # pas et relèverait aussi les enfants étrangers de l'application.
+                # La vue des clés évite une copie de liste par réveil.
+                fired = wait(waiters.keys(), wait_s)
+                now = pc()
+                # Seuls les workers signalés sont relevés
+                for conn in fired:
+                    i = waiters.pop(conn)
+                    worker = workers[i]
+                    workers[i] = None
+                    n_running -= 1
+                    if type(worker) is _ThreadRun:
+                        done_items.append(worker.item(pids[i], names[i]))
+                        done.append(i)
+                        continue
+                    elapsed_ms = (now - started[i]) / 1e6
+                    res = worker.recv_result() or _crash_result(elapsed_ms)
+                    pool.release(worker)
+                    done_items.append(
+                        _item_from_result(pids[i], names[i], res, elapsed_ms)
+                    )
+                    done.append(i)
+                # Dépiler uniquement les échéances dépassées
+                while deadlines and deadlines[0][0] <= now:
+                    _, i = pop(deadlines)
+                    worker = workers[i]
+                    if worker is not None:
+                        workers[i] = None
+                        n_running -= 1
+                        del waiters[worker.results]
+                        pid = pids[i]
+                        if type(worker) is _ThreadRun:
+                            # Thread impossible à tuer: le plugin repassera en sandbox
+                            worker.abandon()
+                            self._timed_out_trusted.add(pid)
+                            stuck.append(i)
                         else:
-                            report.add(
-                                ExecutionItem(
-                                    plugin_id=pid,
-                                    name=plg.meta.name,
-                                    success=False,
-                                    duration_ms=duration_ms,
-                                    error=str(res.get("error", "")),
-                                )
-                            )
-                    else:
-                        duration_ms = (time.perf_counter() - start_t) * 1000.0
-                        report.add(
+                            pool.discard(worker)
+                            done.append(i)
+                        done_items.append(
                             ExecutionItem(
                                 plugin_id=pid,
-                                name=plg.meta.name,
+                                name=names[i],
                                 success=False,
-                                duration_ms=duration_ms,
-                                error=f"timeout après {self.plugin_timeout_s:.1f}s",
+                                duration_ms=(now - started[i]) / 1e6,
+                                error=f"timeout après {timeout:.1f}s",
                             )
                         )
-                        _logger.error(
-                            "Plugin %s timeout après %.1fs", pid, self.plugin_timeout_s
-                        )
-                    # Débloquer les enfants
-                    for ch in children[pid]:
-                        indeg[ch] -= 1
-                        if indeg[ch] == 0:
-                            rch = active_items[ch]
-                            heapq.heappush(ready, (rch.priority, rch.insert_idx, ch))
-                    to_remove.append(pid)
-            for pid in to_remove:
-                try:
-                    proc, _q, _t = running.pop(pid)
-                    if proc.is_alive():
-                        try:
-                            proc.join(0.1)
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-            if running and not ready:
-                # Attendre un court instant avant prochain tour pour éviter busy-wait
-                time.sleep(0.01)
+                        timed_out.append(pid)
+                # Thread en timeout toujours actif (il peut encore modifier le
+                # projet): ses dépendants ne sont jamais débloqués et échouent
+                for i in stuck:
+                    error = f"dépendance {pids[i]} toujours en cours après son timeout"
+                    todo = [i]
+                    while todo:
+                        j = todo.pop()
+                        for ch in child_idx[child_ptr[j] : child_ptr[j + 1]]:
+                            if not blocked[ch]:
+                                blocked[ch] = 1
+                                todo.append(ch)
+                                done_items.append(
+                                    ExecutionItem(
+                                        plugin_id=pids[ch],
+                                        name=names[ch],
+                                        success=False,
+                                        duration_ms=0.0,
+                                        error=error,
+                                    )
+                                )
+                stuck.clear()
+            # Un seul vidage vers le rapport (et un seul log d'erreur) par réveil
+            if done_items:
+                flush(done_items)
+                done_items.clear()
+            if timed_out:
+                _logger.error(
+                    "Plugin(s) timeout après %.1fs:\n  %s",
+                    timeout,
+                    "\n  ".join(timed_out),
+                )
+                timed_out.clear()
+            # Débloquer les enfants des plugins terminés
+            # (tranche CSR copiée en C: pas d'indexation Python par arête);
+            # plusieurs débloqués d'un coup: un seul heapify au lieu de n sift
+            freed: list[tuple[int, int, int]] = []
+            for i in done:
+                for ch in child_idx[child_ptr[i] : child_ptr[i + 1]]:
+                    d = indeg[ch] - 1
+                    indeg[ch] = d
+                    if not d:
+                        freed.append(heap_keys[ch])
+            if len(freed) == 1:
+                push(ready, freed[0])
+            elif freed:
+                ready += freed
+                heapify(ready)
         _logger.info(report.summary())
         return report
 
 
-def _plugin_worker(
-    module_path: str, plugin_id: str, project_root: str, config: dict[str, Any], q
-) -> None:
-    """Charge un module de plugin depuis son chemin et exécute on_pre_compile dans un processus isolé.
+def _build_dep_graph(
+    active_items: dict[str, _PluginRecord],
+) -> tuple[dict[str, int], dict[str, list[str]]]:
+    """Construit (indeg, children) des plugins actifs; ignore les dépendances inconnues."""
+    active_ids = active_items.keys()
+    indeg: dict[str, int] = {pid: 0 for pid in active_items}
+    children: dict[str, list[str]] = {pid: [] for pid in active_items}
+    for pid, rec in active_items.items():
+        reqs = rec.requires_set
+        if not reqs:
+            continue
+        # Intersection d'ensembles en C plutôt qu'un test par dépendance
+        deps = reqs & active_ids
+        if len(deps) != len(reqs):
+            for dep in sorted(reqs - deps):
+                _logger.warning(
+                    "Dépendance manquante pour %s: '%s' (ignorée)", pid, dep
+                )
+        indeg[pid] = len(deps)
+        for dep in deps:
+            children[dep].append(pid)
+    return indeg, children
+
+
+class _DagIndex:
+    """Graphe des plugins actifs indexé par ids entiers denses (0..n-1).
+
+    Enfants au format CSR: ceux de l'id i sont child_idx[child_ptr[i]:child_ptr[i+1]].
+    indeg sert de modèle: le planificateur en prend une copie par exécution.
+    """
+
+    __slots__ = (
+        "graph",
+        "pids",
+        "ids",
+        "indeg",
+        "child_ptr",
+        "child_idx",
+        "heap_keys",
+        "plugins",
+        "names",
+        "module_paths",
+        "attr_names",
+    )
+
+    def __init__(
+        self,
+        graph: tuple[dict[str, _PluginRecord], dict[str, int], dict[str, list[str]]],
+    ) -> None:
+        active_items, indeg, children = graph
+        self.graph = graph
+        self.pids = list(active_items)
+        self.ids = {pid: i for i, pid in enumerate(self.pids)}
+        self.indeg = array("i", (indeg[pid] for pid in self.pids))
+        # Colonnes lues par le planificateur
+        recs = [active_items[pid] for pid in self.pids]
+        # Clés (priority, insert_idx, id) du tas des plugins prêts
+        self.heap_keys = [
+            (rec.priority, rec.insert_idx, i) for i, rec in enumerate(recs)
+        ]
+        self.plugins = [rec.plugin for rec in recs]
+        self.names = [rec.plugin.meta.name for rec in recs]
+        self.module_paths = [rec.module_path_str for rec in recs]
+        self.attr_names = [rec.plugin_attr_name for rec in recs]
+        ptr = array("i", [0])
+        flat = array("i")
+        ids = self.ids
+        for pid in self.pids:
+            flat.extend(ids[ch] for ch in children[pid])
+            ptr.append(len(flat))
+        self.child_ptr = ptr
+        self.child_idx = flat
+
+
+def _widest_level(dag: _DagIndex, counted: set[int]) -> int:
+    """Plus grand nombre de plugins de `counted` sur un même niveau topologique.
+
+    Niveaux de Kahn: niveau 0 = sans dépendance, niveau n+1 = débloqué par le
+    niveau n. Les plugins pris dans un cycle ne sont comptés dans aucun niveau.
+    """
+    indeg = array("i", dag.indeg)
+    child_ptr, child_idx = dag.child_ptr, dag.child_idx
+    level = [i for i, d in enumerate(indeg) if d == 0]
+    widest = 0
+    while level:
+        widest = max(widest, sum(1 for i in level if i in counted))
+        nxt = []
+        for i in level:
+            for ch in child_idx[child_ptr[i] : child_ptr[i + 1]]:
+                d = indeg[ch] - 1
+                indeg[ch] = d
+                if not d:
+                    nxt.append(ch)
+        level = nxt
+    return widest
+
+
+def _topological_order(
+    active_items: dict[str, _PluginRecord],
+    children: dict[str, list[str]],
+    key: Callable[[str], Any],
+) -> list[str]:
+    """Ordre topologique stable: parmi les plugins prêts, le plus petit key() d'abord.
+
+    graphlib.TopologicalSorter tient les compteurs de dépendances (et détecte les
+    cycles); en cas de cycle, les plugins restants sont ajoutés triés par key().
+    """
+    ts: graphlib.TopologicalSorter = graphlib.TopologicalSorter()
+    for pid in active_items:
+        ts.add(pid)
+    for dep, chs in children.items():
+        for ch in chs:
+            ts.add(ch, dep)
+    try:
+        ts.prepare()
+    except graphlib.CycleError:
+        pass  # get_ready() reste utilisable jusqu'au blocage par le cycle
+    heap = [(key(pid), pid) for pid in ts.get_ready()]
+    heapq.heapify(heap)
+    order: list[str] = []
+    while heap:
+        _, pid = heapq.heappop(heap)
+        order.append(pid)
+        ts.done(pid)
+        for ch in ts.get_ready():
+            heapq.heappush(heap, (key(ch), ch))
+    if len(order) != len(active_items):
+        # Cycle détecté; insérer les restants par priorité pour ne pas bloquer
+        placed = set(order)
+        remaining = [pid for pid in active_items if pid not in placed]
+        _logger.error("Cycle de dépendances détecté: %s", ", ".join(remaining))
+        remaining.sort(key=lambda x: (key(x), x))
+        order.extend(remaining)
+    return order
+
+
+def _plugin_attr_name(module: ModuleType, plugin: BcPluginBase) -> Optional[str]:
+    """Nom de l'attribut de module qui référence l'instance de plugin, s'il existe."""
+    if getattr(module, "PLUGIN", None) is plugin:
+        return "PLUGIN"
+    for name, value in vars(module).items():
+        if value is plugin:
+            return name
+    return None
+
+
+def _package_stamp(pkg_dir: Path) -> tuple[int, int]:
+    """(mtime_ns le plus récent, nombre) des .py du package, __pycache__ exclu.
+
+    Toute modification, création ou suppression d'un module du package change
+    l'empreinte, pas seulement celles de __init__.py.
+    """
+    newest = -1
+    count = 0
+    for dirpath, dirnames, filenames in os.walk(pkg_dir):
+        dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+        for name in filenames:
+            if name.endswith(".py"):
+                try:
+                    mtime_ns = os.stat(os.path.join(dirpath, name)).st_mtime_ns
+                except OSError:
+                    continue
+                count += 1
+                if mtime_ns > newest:
+                    newest = mtime_ns
+    return newest, count
+
+
+def _import_plugin_module(pkg_dir: Path, init_file: Path, mod_name: str) -> tuple[
+    ModuleType,
+    tuple[int, int],
+    Optional[tuple[tuple[int, int], ModuleType, dict[str, BcPluginBase]]],
+]:
+    """Importe un package de plugin, ou le reprend de BCASL._module_cache.
+
+    Retourne (module, empreinte, entrée_cache); entrée_cache est None si le
+    module vient d'être exécuté.
+    """
+    stamp = _package_stamp(pkg_dir)
+    cached = BCASL._module_cache.get(str(init_file))
+    if cached is not None and cached[0] == stamp:
+        # Package inchangé: ne pas ré-exécuter son code de niveau module
+        sys.modules[mod_name] = cached[1]
+        return cached[1], stamp, cached
+    # Sous-modules d'une exécution précédente: ré-importés avec le package
+    prefix = mod_name + "."
+    for name in [n for n in sys.modules if n.startswith(prefix)]:
+        sys.modules.pop(name, None)
+    spec = importlib.util.spec_from_file_location(
+        mod_name, str(init_file), submodule_search_locations=[str(pkg_dir)]
+    )
+    if spec is None or spec.loader is None:
+        raise ImportError("spec invalide")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[mod_name] = module
+    spec.loader.exec_module(module)  # type: ignore[attr-defined]
+    return module, stamp, None
+
+
+@functools.lru_cache(maxsize=1)
+def _plugin_pycache_dir() -> Optional[str]:
+    """Dossier utilisateur du bytecode des plugins; None si non inscriptible.
+
+    PYCOMPILER_BCASL_PYCACHE remplace l'emplacement par défaut (vide: désactivé).
+    """
+    path = os.environ.get("PYCOMPILER_BCASL_PYCACHE")
+    if path is None:
+        base = (
+            os.environ.get("XDG_CACHE_HOME")
+            or os.environ.get("LOCALAPPDATA")
+            or os.path.join(os.path.expanduser("~"), ".cache")
+        )
+        path = os.path.join(base, "pycompiler", "bcasl_pycache")
+    if not path:
+        return None
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError:
+        return None
+    return path if os.access(path, os.W_OK) else None
+
+
+def _plugin_pyc_path(source: str) -> Optional[str]:
+    """Chemin du .pyc d'un plugin dans le cache utilisateur.
+
+    Clé: nom du package (identifiant du plugin), pas le chemin source: une
+    nouvelle version remplace l'ancienne au lieu de s'y ajouter, et le cache
+    reste borné au nombre de plugins distincts. Deux packages homonymes se
+    partagent le fichier; l'en-tête (voir _pyc_matches) écarte toute version
+    qui ne correspond pas à la source.
+    """
+    cache_dir = _plugin_pycache_dir()
+    if cache_dir is None or sys.implementation.cache_tag is None:
+        return None
+    name = os.path.basename(os.path.dirname(os.path.abspath(source)))
+    return os.path.join(cache_dir, f"{name}.{sys.implementation.cache_tag}.pyc")
+
+
+def _pyc_matches(data: bytes, st: os.stat_result) -> bool:
+    """En-tête .pyc valide pour la source (magic, mode timestamp, mtime et taille)."""
+    return (
+        data[:4] == importlib.util.MAGIC_NUMBER
+        and int.from_bytes(data[4:8], "little") == 0
+        and int.from_bytes(data[8:12], "little") == int(st.st_mtime) & 0xFFFFFFFF
+        and int.from_bytes(data[12:16], "little") == st.st_size & 0xFFFFFFFF
+    )
+
+
+def _precompile_plugin(source: str) -> None:
+    """Compile le __init__.py d'un plugin sandboxé vers le cache utilisateur.
+
+    Appelé seulement quand un pool sandbox va servir (voir run_pre_compile):
+    les workers chargent ce bytecode même si le __pycache__ du plugin n'est pas
+    inscriptible (CI, conteneurs), sans recompiler à chaque démarrage.
+    """
+    cfile = _plugin_pyc_path(source)
+    if cfile is None:
+        return
+    try:
+        with open(cfile, "rb") as f:
+            if _pyc_matches(f.read(16), os.stat(source)):
+                return
+    except OSError:
+        pass
+    try:
+        py_compile.compile(
+            source,
+            cfile=cfile,
+            doraise=False,
+            quiet=2,
+            invalidation_mode=py_compile.PycInvalidationMode.TIMESTAMP,
+        )
+    except Exception:
+        pass
+
+
+class _PrecompiledSourceLoader(importlib.machinery.SourceFileLoader):
+    """Charge le bytecode précompilé par le parent s'il correspond à la source.
 
-    Renvoie un dict via la queue: {ok: bool, error: str, duration_ms: float}
+    Même validation que l'import standard (magic, mtime et taille de la source);
+    sinon compilation classique via SourceFileLoader.
+    """
+
+    def get_code(self, fullname):
+        cfile = _plugin_pyc_path(self.path)
+        if cfile is not None:
+            try:
+                with open(cfile, "rb") as f:
+                    data = f.read()
+                if _pyc_matches(data, os.stat(self.path)):
+                    return marshal.loads(memoryview(data)[16:])
+            except (OSError, ValueError, EOFError, TypeError):
+                pass
+        return super().get_code(fullname)
+
+
+def _run_in_process(
+    pid: str, plg: BcPluginBase, ctx: PreCompileContext
+) -> ExecutionItem:
+    """Exécute on_pre_compile dans le processus courant et renvoie l'item de rapport."""
+    start = time.perf_counter()
+    try:
+        plg.on_pre_compile(ctx)
+    except Exception as exc:
+        return ExecutionItem(
+            plugin_id=pid,
+            name=plg.meta.name,
+            success=False,
+            duration_ms=(time.perf_counter() - start) * 1000.0,
+            error=str(exc),
+        )
+    return ExecutionItem(
+        plugin_id=pid,
+        name=plg.meta.name,
+        success=True,
+        duration_ms=(time.perf_counter() - start) * 1000.0,
+    )
+
+
+class _ThreadRun:
+    """Plugin exécuté dans un thread daemon du processus courant, sans spawn ni pickling.
+
+    future reçoit l'item de rapport; results est la lecture d'un pipe signalé à
+    la fin du thread, attendue par le planificateur avec les pipes des workers
+    sandbox. Un thread en timeout ne peut pas être interrompu: abandon() ferme
+    seulement le pipe et le thread continue en arrière-plan.
+    """
+
+    __slots__ = ("future", "results", "_notify")
+
+    def __init__(self, pid: str, plg: BcPluginBase, ctx: PreCompileContext) -> None:
+        self.future: Future = Future()
+        self.results, self._notify = mp.Pipe(duplex=False)
+        threading.Thread(
+            target=self._run,
+            args=(pid, plg, ctx),
+            name=f"bcasl-trusted-{pid}",
+            daemon=True,
+        ).start()
+
+    def _run(self, pid: str, plg: BcPluginBase, ctx: PreCompileContext) -> None:
+        try:
+            self.future.set_result(_run_in_process(pid, plg, ctx))
+        except BaseException as exc:
+            # SystemExit... levée par le plugin: le thread s'arrête
+            self.future.set_exception(exc)
+        try:
+            self._notify.send_bytes(b"")
+        except (OSError, ValueError):
+            pass  # Abandonné après timeout: plus personne n'écoute
+        self._notify.close()
+
+    def item(self, pid: str, name: str) -> ExecutionItem:
+        """Item de rapport du thread terminé (appelé une fois le pipe signalé)."""
+        self.results.close()
+        if self.future.exception() is None:
+            return self.future.result()
+        return ExecutionItem(
+            plugin_id=pid,
+            name=name,
+            success=False,
+            duration_ms=0.0,
+            error="thread du plugin interrompu",
+        )
+
+    def abandon(self) -> None:
+        self.results.close()
+
+
+# Résultat d'un worker sandbox: (ok, error, duration_ms), tuple picklé tel quel
+_WorkerResult = tuple[bool, str, float]
+
+
+def _item_from_result(
+    pid: str, name: str, res: _WorkerResult, elapsed_ms: float
+) -> ExecutionItem:
+    """Convertit le résultat (ok, error, duration_ms) d'un worker en item de rapport.
+
+    elapsed_ms (mesuré côté parent) sert si le worker n'a pas chronométré.
+    """
+    ok, error, duration_ms = res
+    duration_ms = float(duration_ms or elapsed_ms)
+    if ok:
+        return ExecutionItem(
+            plugin_id=pid, name=name, success=True, duration_ms=duration_ms
+        )
+    return ExecutionItem(
+        plugin_id=pid,
+        name=name,
+        success=False,
+        duration_ms=duration_ms,
+        error=str(error),
+    )
+
+
+# Taille max d'une trace d'erreur renvoyée par un worker (message IPC compact)
+_MAX_ERROR_CHARS = 4000
+
+
+def _shutdown_workers(workers: list) -> None:
+    """Arrête proprement les workers d'un pool (appelé par close() ou à la sortie)."""
+    for w in list(workers):
+        try:
+            w.tasks.send(None)
+        except Exception:
+            pass
+    for w in list(workers):
+        w.stop()
+    workers.clear()
+
+
+class _SandboxWorker:
+    """Processus sandbox persistant exécutant successivement plusieurs plugins.
+
+    Tâches et résultats passent par deux Pipe(duplex=False): un seul write/read
+    par message, sans thread d'alimentation comme mp.Queue.
+    """
+
+    __slots__ = ("proc", "tasks", "results", "runs", "dead", "config_gen")
+
+    def __init__(self, mp_ctx, config_blob: bytes, config_gen: int = 0) -> None:
+        task_r, self.tasks = mp_ctx.Pipe(duplex=False)
+        self.results, result_w = mp_ctx.Pipe(duplex=False)
+        self.proc = mp_ctx.Process(
+            target=_worker_main,
+            args=(task_r, result_w, config_blob),
+            name="bcasl-sandbox",
+        )
+        self.proc.start()
+        # Fermer les extrémités enfant: EOF côté parent si le worker meurt (et inversement)
+        task_r.close()
+        result_w.close()
+        self.runs = 0
+        self.dead = False
+        # Génération de config connue du worker (voir _SandboxPool.set_config)
+        self.config_gen = config_gen
+
+    def submit(
+        self,
+        module_path: str,
+        plugin_id: str,
+        project_root: str,
+        attr_name: Optional[str] = None,
+    ) -> bool:
+        """Envoie une tâche; False si le worker est mort (pipe fermé côté enfant)."""
+        self.runs += 1
+        try:
+            self.tasks.send(("run", module_path, plugin_id, project_root, attr_name))
+        except (OSError, ValueError):
+            self.dead = True
+            return False
+        return True
+
+    def recv_result(self) -> Optional[_WorkerResult]:
+        """Résultat d'un worker signalé par wait(); None (worker mort) sur EOF.
+
+        Pas de poll() préalable: wait() a déjà établi que le pipe est lisible.
+        """
+        try:
+            return pickle.loads(self.results.recv_bytes())
+        except Exception:
+            self.dead = True
+        return None
+
+    def stop(self) -> None:
+        # AssertionError: processus jamais démarré; ValueError: déjà fermé
+        with suppress(AssertionError, ValueError):
+            self.proc.join(1.0)
+        self.kill()
+
+    def kill(self) -> None:
+        # Sans is_alive() préalable (waitpid): terminate() ignore un processus
+        # déjà relevé et join() retourne aussitôt
+        with suppress(OSError, AssertionError, ValueError):
+            self.proc.terminate()
+            self.proc.join(1.0)
+        for conn in (self.tasks, self.results):
+            with suppress(OSError):
+                conn.close()
+
+
+class _SandboxPool:
+    """Pool de processus sandbox (spawn) réutilisés d'un plugin à l'autre.
+
+    Le démarrage de l'interpréteur et l'initialisation Qt/limites (_worker_init)
+    ne sont payés qu'une fois par worker. Un worker en timeout est tué puis
+    remplacé à la demande. max_runs > 0 recycle un worker après max_runs tâches.
+    pin_cpus épingle chaque worker sur un CPU (tourniquet) là où l'OS le permet.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        config: dict[str, Any],
+        max_runs: int = 0,
+        pin_cpus: bool = False,
+    ) -> None:
+        self.size = max(1, int(size))
+        self.config = config
+        self.config_gen = 0
+        # Config picklée une fois par génération, partagée par tous les workers
+        self._config_blob: Optional[bytes] = None
+        self.max_runs = int(max_runs)
+        self._ctx = mp.get_context("spawn")
+        self._idle: list[_SandboxWorker] = []
+        self._workers: list[_SandboxWorker] = []
+        # CPUs autorisés pour ce processus (Linux); vide: pas d'épinglage
+        self._cpus: list[int] = []
+        if pin_cpus and hasattr(os, "sched_setaffinity"):
+            try:
+                self._cpus = sorted(os.sched_getaffinity(0))
+            except OSError:
+                pass
+        self._next_cpu = 0
+        # Arrêt garanti avant le join des enfants non-daemon à la sortie
+        self._finalizer = mp.util.Finalize(
+            self, _shutdown_workers, args=(self._workers,), exitpriority=10
+        )
+
+    def acquire(self) -> _SandboxWorker:
+        # Pas de proc.is_alive() (waitpid): un worker mort au repos est détecté
+        # par l'échec d'écriture sur son pipe de tâches (voir submit)
+        while self._idle:
+            w = self._idle.pop()
+            if not w.dead:
+                if w.config_gen != self.config_gen:
+                    try:
+                        w.tasks.send(("config", self.config_blob()))
+                    except (OSError, ValueError):
+                        self.discard(w)
+                        continue
+                    w.config_gen = self.config_gen
+                return w
+            self.discard(w)
+        return self._spawn()
+
+    def submit(
+        self,
+        module_path: str,
+        plugin_id: str,
+        project_root: str,
+        attr_name: Optional[str] = None,
+    ) -> _SandboxWorker:
+        """Soumet une tâche au premier worker disponible capable de la recevoir."""
+        while True:
+            w = self.acquire()
+            if w.submit(module_path, plugin_id, project_root, attr_name):
+                return w
+            self.discard(w)
+
+    def prestart(self, n: int) -> None:
+        """Lance des workers jusqu'à en avoir n vivants (au plus size)."""
+        for _ in range(min(n, self.size) - len(self._workers)):
+            self._idle.append(self._spawn())
+
+    def _spawn(self) -> _SandboxWorker:
+        w = _SandboxWorker(self._ctx, self.config_blob(), self.config_gen)
+        self._workers.append(w)
+        if self._cpus:
+            # Un CPU par worker, épinglé une fois pour toute sa durée de vie
+            cpu = self._cpus[self._next_cpu % len(self._cpus)]
+            self._next_cpu += 1
+            try:
+                os.sched_setaffinity(w.proc.pid, {cpu})
+            except OSError:
+                pass
+        return w
+
+    def set_config(self, config: dict[str, Any]) -> None:
+        """Nouvelle config: envoyée une fois à chaque worker, à sa prochaine tâche."""
+        if config != self.config:
+            self.config = dict(config)
+            self.config_gen += 1
+            self._config_blob = None
+
+    def config_blob(self) -> bytes:
+        """Config courante sérialisée (une seule fois par génération)."""
+        if self._config_blob is None:
+            self._config_blob = pickle.dumps(self.config, pickle.HIGHEST_PROTOCOL)
+        return self._config_blob
+
+    def release(self, w: _SandboxWorker) -> None:
+        # Le worker vient de renvoyer un résultat: dead suffit (EOF sinon)
+        if w.dead or (self.max_runs and w.runs >= self.max_runs):
+            try:
+                w.tasks.send(None)
+            except Exception:
+                pass
+            self.discard(w, graceful=True)
+        else:
+            self._idle.append(w)
+
+    def discard(self, w: _SandboxWorker, graceful: bool = False) -> None:
+        if graceful:
+            w.stop()
+        else:
+            w.kill()
+        try:
+            self._workers.remove(w)
+        except ValueError:
+            pass
+
+    def close(self) -> None:
+        self._idle.clear()
+        self._finalizer()
+
+
+def _crash_result(elapsed_ms: float) -> _WorkerResult:
+    return (False, "aucun résultat renvoyé (crash du processus enfant ?)", elapsed_ms)
+
+
+def _worker_main(tasks, results, config_blob: bytes) -> None:
+    """Boucle d'un worker sandbox: initialisation unique puis tâches successives.
+
+    Messages reçus: ("run", module_path, plugin_id, project_root, attr_name),
+    ("config", config_blob) pour remplacer la config locale, ou None pour s'arrêter.
+    La config n'est donc transmise qu'une fois par worker, pas à chaque tâche,
+    et n'est picklée qu'une fois côté parent (voir _SandboxPool.config_blob).
+    """
+    config = pickle.loads(config_blob)
+    _worker_init(_options_of(config))
+    while True:
+        try:
+            msg = tasks.recv()
+        except (EOFError, OSError, KeyboardInterrupt):
+            # Parent disparu (EOF) ou interruption: ne pas rester orphelin
+            break
+        if msg is None:
+            break
+        if msg[0] == "config":
+            config = pickle.loads(msg[1])
+            continue
+        _, module_path, plugin_id, project_root, attr_name = msg
+        res = _plugin_worker(module_path, plugin_id, project_root, config, attr_name)
+        try:
+            # pickle direct du tuple: plus compact que ForkingPickler sur un dict
+            results.send_bytes(pickle.dumps(res, pickle.HIGHEST_PROTOCOL))
+        except (OSError, ValueError):
+            break
+
+
+# Modules Qt dont l'import déclenche le garde QProgressDialog dans un worker
+_QT_WIDGETS_MODULES = {"PySide6.QtWidgets": "PySide6", "PyQt5.QtWidgets": "PyQt"}
+_SANDBOX_QAPP: Any = None
+
+
+def _patch_qt_widgets(module: ModuleType, create_app: bool) -> None:
+    """Bloque QProgressDialog (Plugins_SDK.progress obligatoire) et crée la QApplication."""
+    global _SANDBOX_QAPP
+    binding = _QT_WIDGETS_MODULES.get(module.__name__, "Qt")
+
+    class _NoDirectProgressDialog:  # type: ignore
+        def __init__(self, *args, **kwargs) -> None:
+            raise RuntimeError(
+                f"Plugins must use Plugins_SDK.progress(...) instead of {binding}.QProgressDialog"
+            )
+
+    try:
+        module.QProgressDialog = _NoDirectProgressDialog  # type: ignore[attr-defined]
+    except Exception:
+        pass
+    if create_app and _SANDBOX_QAPP is None:
+        try:
+            qapp = module.QApplication  # type: ignore[attr-defined]
+            # Référence gardée pendant toute la vie du worker
+            _SANDBOX_QAPP = qapp.instance() or qapp([])
+        except Exception:
+            pass
+
+
+class _QtWidgetsLoader(importlib.abc.Loader):
+    """Délègue au loader réel puis applique _patch_qt_widgets au module chargé."""
+
+    def __init__(self, loader: Any, create_app: bool) -> None:
+        self._loader = loader
+        self._create_app = create_app
+
+    def create_module(self, spec: Any) -> Any:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self._loader.exec_module(module)
+        _patch_qt_widgets(module, self._create_app)
+
+
+class _QtWidgetsFinder(importlib.abc.MetaPathFinder):
+    """Intercepte le premier import de QtWidgets (PySide6/PyQt5) dans un worker."""
+
+    def __init__(self, create_app: bool) -> None:
+        self._create_app = create_app
+
+    def find_spec(self, fullname: str, path: Any, target: Any = None) -> Any:
+        if fullname not in _QT_WIDGETS_MODULES:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None and spec.loader is not None:
+                spec.loader = _QtWidgetsLoader(spec.loader, self._create_app)
+                return spec
+        return None
+
+
+def _install_qt_widgets_hook(create_app: bool) -> None:
+    """Garde Qt paresseux: Qt (>100 ms, ~30 Mo) n'est chargé que si un plugin l'importe."""
+    for name in _QT_WIDGETS_MODULES:
+        module = sys.modules.get(name)
+        if module is not None:
+            _patch_qt_widgets(module, create_app)
+    if not any(isinstance(f, _QtWidgetsFinder) for f in sys.meta_path):
+        sys.meta_path.insert(0, _QtWidgetsFinder(create_app))
+
+
+def _worker_init(_opts: dict[str, Any]) -> None:
+    """Prépare un worker sandbox (interactivité, Qt, limites) une seule fois.
+
+    Reçoit la section "options" déjà extraite de la config.
     """
-    import importlib.util as _ilu
     import os as _os
-    import sys as _sys
-    import time as _time
-    import traceback as _tb
-    from pathlib import Path as _Path
 
     # Configure interactivity and Qt platform for sandbox worker based on config/env
     try:
-        _opts = (
-            dict(config or {}).get("options", {}) if isinstance(config, dict) else {}
-        )
         _env_nonint = _os.environ.get("PYCOMPILER_NONINTERACTIVE_PLUGINS")
         _env_offscreen = _os.environ.get("PYCOMPILER_OFFSCREEN_PLUGINS")
         _noninteractive = (
@@ -702,84 +1472,33 @@ def _plugin_worker(
             _os.environ["QT_QPA_PLATFORM"] = "offscreen"
     except Exception:
         pass
-    # Optionally initialize a minimal Qt application so plugins can show message boxes in sandbox
+    # Qt n'est plus importé au démarrage du worker: le garde QProgressDialog et la
+    # QApplication optionnelle sont posés au premier import de QtWidgets
     try:
-        _opts2 = (
-            dict(config or {}).get("options", {}) if isinstance(config, dict) else {}
-        )
         _env_allow = _os.environ.get("PYCOMPILER_SANDBOX_DIALOGS")
         _allow_dialogs = (
             (str(_env_allow).strip().lower() in ("1", "true", "yes"))
             if (_env_allow is not None)
-            else bool(_opts2.get("allow_sandbox_dialogs", True))
+            else bool(_opts.get("allow_sandbox_dialogs", True))
         )
         # Respect non-interactive/headless
-        if _allow_dialogs and (
+        _create_app = _allow_dialogs and (
             str(_os.environ.get("PYCOMPILER_NONINTERACTIVE", ""))
-        ).strip().lower() not in (
-            "1",
-            "true",
-            "yes",
-        ):
+        ).strip().lower() not in ("1", "true", "yes")
+        if _create_app:
             # Wayland fractional scaling safety
             _os.environ.setdefault("QT_WAYLAND_DISABLE_FRACTIONAL_SCALE", "1")
-            try:
-                from PySide6.QtWidgets import QApplication as _QApp  # type: ignore
-            except Exception:
-                try:
-                    from PyQt5.QtWidgets import QApplication as _QApp  # type: ignore
-                except Exception:
-                    _QApp = None  # type: ignore
-            if _QApp is not None:
-                try:
-                    if _QApp.instance() is None:
-                        _sandbox_qapp = _QApp(
-                            []
-                        )  # noqa: F841 - keep reference alive during worker
-                except Exception:
-                    pass
     except Exception:
-        pass
+        _create_app = False
     # Enforce Plugins_SDK.progress usage: block direct Qt QProgressDialog in plugins
     try:
         _os.environ["PYCOMPILER_ENFORCE_SDK_PROGRESS"] = "1"
     except Exception:
         pass
-    try:
-        from PySide6 import QtWidgets as _QtW2  # type: ignore
-
-        class _NoDirectProgressDialog:  # type: ignore
-            def __init__(self, *args, **kwargs) -> None:
-                raise RuntimeError(
-                    "Plugins must use Plugins_SDK.progress(...) instead of PySide6.QProgressDialog"
-                )
-
-        try:
-            _QtW2.QProgressDialog = _NoDirectProgressDialog  # type: ignore[attr-defined]
-        except Exception:
-            pass
-    except Exception:
-        try:
-            from PyQt5 import QtWidgets as _QtW2  # type: ignore
-
-            class _NoDirectProgressDialog:  # type: ignore
-                def __init__(self, *args, **kwargs) -> None:
-                    raise RuntimeError(
-                        "Plugins must use Plugins_SDK.progress(...) instead of PyQt.QProgressDialog"
-                    )
-
-            try:
-                _QtW2.QProgressDialog = _NoDirectProgressDialog  # type: ignore[attr-defined]
-            except Exception:
-                pass
-        except Exception:
-            pass
+    _install_qt_widgets_hook(_create_app)
     # Apply resource limits (POSIX) if configured
     try:
-        _opts3 = (
-            dict(config or {}).get("options", {}) if isinstance(config, dict) else {}
-        )
-        _limits = _opts3.get("plugin_limits", {}) if isinstance(_opts3, dict) else {}
+        _limits = _opts.get("plugin_limits", {}) or {}
         _mem_mb = int(_limits.get("mem_mb", 0))
         _cpu_s = int(_limits.get("cpu_time_s", 0))
         _nofile = int(_limits.get("nofile", 0))
@@ -809,46 +1528,76 @@ def _plugin_worker(
             pass
     except Exception:
         pass
+
+
+def _load_sandbox_module(module_path: str) -> ModuleType:
+    """Charge (ou recharge) le module d'un plugin dans le worker sandbox."""
+    parent = Path(module_path).parent
+    # Nom propre au package: un worker réutilisé ne mélange pas les sous-modules
+    mod_name = "bcasl_sandbox_" + parent.name
+    for k in [k for k in sys.modules if k == mod_name or k.startswith(mod_name + ".")]:
+        sys.modules.pop(k, None)
+    spec = importlib.util.spec_from_file_location(
+        mod_name,
+        module_path,
+        loader=_PrecompiledSourceLoader(mod_name, module_path),
+        submodule_search_locations=[str(parent)],
+    )
+    if spec is None or spec.loader is None:
+        raise ImportError("spec invalide")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)  # type: ignore[attr-defined]
+    return module
+
+
+def _register_fallback(
+    module: ModuleType, plugin_id: str, project_root: str, config: dict[str, Any]
+) -> BcPluginBase:
+    """Retrouve le plugin en rejouant bcasl_register dans un gestionnaire temporaire."""
     try:
-        spec = _ilu.spec_from_file_location(
-            "bcasl_sandbox_module",
-            module_path,
-            submodule_search_locations=[str(_Path(module_path).parent)],
-        )
-        if spec is None or spec.loader is None:
-            raise ImportError("spec invalide")
-        module = _ilu.module_from_spec(spec)
-        _sys.modules[spec.name] = module
-        spec.loader.exec_module(module)  # type: ignore[attr-defined]
-        # Récupérer PLUGIN ou fallback via bcasl_register
-        plg = getattr(module, "PLUGIN", None)
+        mgr = BCASL(
+            Path(project_root), config=config, sandbox=False
+        )  # pas de sandbox récursif
+        if hasattr(module, "bcasl_register") and callable(
+            getattr(module, "bcasl_register")
+        ):
+            module.bcasl_register(mgr)
+        rec = getattr(mgr, "_registry", {}).get(plugin_id)
+        if rec is None:
+            raise RuntimeError(f"Plugin '{plugin_id}' introuvable dans le module")
+        return rec.plugin
+    except Exception as ex:
+        raise RuntimeError(f"Impossible d'instancier le plugin: {ex}")
+
+
+def _plugin_worker(
+    module_path: str,
+    plugin_id: str,
+    project_root: str,
+    config: dict[str, Any],
+    attr_name: Optional[str] = None,
+) -> _WorkerResult:
+    """Charge un module de plugin depuis son chemin et exécute on_pre_compile (worker sandbox).
+
+    L'environnement du worker (Qt, limites) est préparé une fois par _worker_init.
+    Renvoie un tuple (ok: bool, error: str, duration_ms: float)
+    """
+    try:
+        module = _load_sandbox_module(module_path)
+        # Attribut relevé côté parent (voir _plugin_attr_name), sinon PLUGIN,
+        # sinon fallback via bcasl_register
+        plg = getattr(module, attr_name or "PLUGIN", None)
         if plg is None or getattr(getattr(plg, "meta", None), "id", None) != plugin_id:
-            try:
-                # Fallback: ré-enregistrer dans un gestionnaire temporaire
-                from bcasl import PreCompileContext as _PCC
-
-                mgr = BCASL(
-                    _Path(project_root), config=config, sandbox=False
-                )  # pas de sandbox récursif
-                if hasattr(module, "bcasl_register") and callable(
-                    getattr(module, "bcasl_register")
-                ):
-                    module.bcasl_register(mgr)
-                rec = getattr(mgr, "_registry", {}).get(plugin_id)
-                if rec is None:
-                    raise RuntimeError(
-                        f"Plugin '{plugin_id}' introuvable dans le module"
-                    )
-                plg = rec.plugin
-            except Exception as ex:
-                raise RuntimeError(f"Impossible d'instancier le plugin: {ex}")
-        # Exécution
-        from bcasl import PreCompileContext as _PCC
-
-        ctx = _PCC(_Path(project_root), config=dict(config or {}))
-        t0 = _time.perf_counter()
+            plg = _register_fallback(module, plugin_id, project_root, config)
+        ctx = PreCompileContext(Path(project_root), config=dict(config or {}))
+        t0 = time.perf_counter()
         plg.on_pre_compile(ctx)
-        dur = (_time.perf_counter() - t0) * 1000.0
-        q.put({"ok": True, "error": "", "duration_ms": dur})
+        dur = (time.perf_counter() - t0) * 1000.0
+        return (True, "", dur)
     except Exception:
-        q.put({"ok": False, "error": _tb.format_exc(), "duration_ms": 0.0})
+        err = traceback.format_exc()
+        if len(err) > _MAX_ERROR_CHARS:
+            # Garder la fin: c'est elle qui porte l'exception levée
+            err = "…\n" + err[-_MAX_ERROR_CHARS:]
+        return (False, err, 0.0)
@@ -74,6 +74,17 @@ TAG_PRIORITY_MAP = {
 # Valeur par défaut pour les tags inconnus
 DEFAULT_TAG_PRIORITY = 100
 
+# Noms lisibles des phases (par score)
+_PHASE_NAMES = {
+    0: "Nettoyage",
+    10: "Validation",
+    20: "Préparation",
+    30: "Conformité",
+    40: "Linting",
+    50: "Obfuscation",
+    100: "Défaut",
+}
+
 
 def compute_tag_order(meta_map: dict[str, dict[str, Any]]) -> list[str]:
     """Trie les plugins par score de tag (plus petit d'abord), puis par id.
@@ -89,54 +100,33 @@ def compute_tag_order(meta_map: dict[str, dict[str, Any]]) -> list[str]:
     - 40: Linting (lint, format, typecheck, style)
     - 50: Obfuscation (obfuscate, transpile, protect, encrypt)
     - 100: Défaut (aucun tag reconnu)
-    """
-
-    def _compute_score(pid: str) -> int:
-        """Calcule le score de priorité pour un plugin.
-
-        Retourne le score minimum parmi tous les tags du plugin.
-        Si aucun tag, retourne DEFAULT_TAG_PRIORITY.
-        """
-        try:
-            tags = meta_map.get(pid, {}).get("tags")
-            if not tags:
-                return DEFAULT_TAG_PRIORITY
 
-            if not isinstance(tags, (list, tuple)):
-                return DEFAULT_TAG_PRIORITY
+    Ordre total et déterministe (égalités départagées par id); les dépendances
+    entre plugins sont résolues à l'exécution par executor._topological_order.
+    """
 
-            # Normaliser les tags et trouver le score minimum
-            scores = []
+    # Scores calculés une fois par plugin, puis tri sur des tuples (score, id)
+    get = TAG_PRIORITY_MAP.get
+    scores: dict[str, int] = {}
+    for pid, meta in meta_map.items():
+        score = DEFAULT_TAG_PRIORITY
+        tags = meta.get("tags") if isinstance(meta, dict) else None
+        if isinstance(tags, (list, tuple)):
             for tag in tags:
                 tag_str = str(tag).strip().lower()
                 if tag_str:
-                    score = TAG_PRIORITY_MAP.get(tag_str, DEFAULT_TAG_PRIORITY)
-                    scores.append(score)
-
-            return min(scores) if scores else DEFAULT_TAG_PRIORITY
-        except Exception:
-            return DEFAULT_TAG_PRIORITY
-
-    # Trier par (score, id) pour stabilité et lisibilité
-    return sorted(meta_map.keys(), key=lambda x: (_compute_score(x), x))
+                    tag_score = get(tag_str, DEFAULT_TAG_PRIORITY)
+                    if tag_score < score:
+                        score = tag_score
+        scores[pid] = score
+    return sorted(scores, key=lambda pid: (scores[pid], pid))
 
 
 def get_tag_phase_name(tag: str) -> str:
     """Retourne le nom lisible de la phase pour un tag donné."""
     tag_lower = str(tag).strip().lower()
     score = TAG_PRIORITY_MAP.get(tag_lower, DEFAULT_TAG_PRIORITY)
-
-    phase_names = {
-        0: "Nettoyage",
-        10: "Validation",
-        20: "Préparation",
-        30: "Conformité",
-        40: "Linting",
-        50: "Obfuscation",
-        100: "Défaut",
-    }
-
-    return phase_names.get(score, f"Phase {score}")
+    return _PHASE_NAMES.get(score, f"Phase {score}")
 
 
 def describe_plugin_priority(plugin_id: str, tags: list[str]) -> str:
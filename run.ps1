@@ -148,6 +148,20 @@ if ($SkipInstall) {
   Write-Warn "Aucun fichier $Requirements trouvé — installation ignorée"
 }
 
+# Precompile bcasl bytecode (hash-based .pyc, PEP 552) for -O0 and -OO workers
+Write-Info 'Précompilation du bytecode (bcasl)'
+if (-not $env:SOURCE_DATE_EPOCH) {
+  # Date du dernier commit (reproductible, comme run.sh), sinon l'heure courante
+  $epoch = $null
+  if (Get-Command git -ErrorAction SilentlyContinue) {
+    try { $epoch = (& git log -1 --format=%ct 2>$null | Select-Object -First 1) } catch {}
+  }
+  if (-not $epoch) { $epoch = [DateTimeOffset]::UtcNow.ToUnixTimeSeconds() }
+  $env:SOURCE_DATE_EPOCH = "$epoch".Trim()
+}
+& $VENV_PY -m compileall -q -o 0 -o 2 --invalidation-mode checked-hash bcasl
+if ($LASTEXITCODE -ne 0) { Write-Warn 'Précompilation ignorée (bcasl non compilable ou non inscriptible)' }
+
 # Read app version (best-effort)
 $APP_VERSION = (& $VENV_PY -c "import sys`ntry:`n import Core; print(getattr(Core,'__version__','?'))`nexcept Exception:`n print('?')" 2>$null)
 Write-Host "`n—— Lancement de main.py (version $APP_VERSION) ——"
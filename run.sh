@@ -215,6 +215,15 @@ else
   log_warn "Installation des dépendances ignorée (--skip-install)"
 fi
 
+# --- Bytecode precompile ---------------------------------------------------
+# Les workers BCASL (multiprocessing "spawn") ré-importent le package bcasl à
+# chaque démarrage: on livre des .pyc hash-based (PEP 552, reproductibles via
+# SOURCE_DATE_EPOCH) pour les niveaux -O0 et -OO (docstrings retirées).
+section "Précompilation du bytecode (bcasl)"
+SOURCE_DATE_EPOCH=${SOURCE_DATE_EPOCH:-$(git log -1 --format=%ct 2>/dev/null || date +%s)} \
+  "$VENV_PY" -m compileall -q -o 0 -o 2 --invalidation-mode checked-hash bcasl \
+  || log_warn "Précompilation ignorée (bcasl non compilable ou non inscriptible)"
+
 # --- Launch ---------------------------------------------------------------
 APP_VERSION=$($VENV_PY - <<'PY'
 try: